@@ -12,18 +12,51 @@ Usage:
 
 import argparse
 import base64
+import codecs
+import contextlib
+import gzip
+import hashlib
+import http.client
+import importlib.util
+import io
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
+import time
 import urllib.error
-import urllib.request
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urljoin, urlparse
+
+try:
+    # Optional: several times faster than the json module on large payloads
+    import orjson
+    _json_loads = orjson.loads
+
+    _json_dumps_bytes = orjson.dumps
+
+    def _json_dumps_indented(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _json_dumps_indented(obj):
+        return json.dumps(obj, indent=2)
 
 JENKINS_BASE_URL = os.environ.get("JENKINS_BASE_URL", "").rstrip("/")
 JENKINS_USER = os.environ.get("JENKINS_USER", "")
 
+# GitHub token for direct REST calls. When unset, fall back to the gh CLI.
+GH_TOKEN = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN", "")
+GITHUB_API_HOST = "api.github.com"
+GITHUB_REPO = "brave/brave-core"
+GITHUB_ISSUES_REPO = "brave/brave-browser"
+
 # Stage name keywords that indicate pre-test infrastructure failures.
 # These warrant WIPE_WORKSPACE to clear potentially corrupted build state.
 WIPE_WORKSPACE_KEYWORDS = {
@@ -45,6 +78,46 @@ WIPE_WORKSPACE_KEYWORDS = {
     "environment",
 }
 
+# Matches any WIPE_WORKSPACE keyword in a lowercased stage name
+_WIPE_RE = re.compile(
+    "|".join(
+        sorted(map(re.escape, WIPE_WORKSPACE_KEYWORDS), key=len, reverse=True)
+    )
+)
+
+# On-disk cache shared by the tools in this repo, one subdirectory per tool
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "brave-core-tools",
+    "retrigger-ci",
+)
+
+# Gzipped Jenkins responses of finished (immutable) builds. Bump the schema
+# version when the stored format changes so old entries are ignored.
+BUILD_CACHE_SCHEMA_VERSION = 1
+BUILD_CACHE_DIR = os.path.join(CACHE_DIR, f"builds-v{BUILD_CACHE_SCHEMA_VERSION}")
+
+# wfapi run statuses after which a build's stages and console no longer change
+FINISHED_BUILD_STATUSES = {"SUCCESS", "FAILED", "ABORTED", "UNSTABLE"}
+
+# The script is at: brave-core-tools/.claude/skills/make-ci-green/retrigger-ci.py
+# The src dir is at: src/ (4 levels up from the script)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..", "src"))
+FLAKE_SCRIPT = os.path.normpath(
+    os.path.join(SCRIPT_DIR, "..", "..", "..", "scripts", "check-upstream-flake.py")
+)
+
+# Checks and tests are analyzed on worker threads; serialize their progress
+# output so lines from different threads don't interleave.
+_log_lock = threading.Lock()
+
+
+def log(message):
+    """Print a progress or diagnostic message to stderr."""
+    with _log_lock:
+        print(message, file=sys.stderr)
+
 
 def get_jenkins_auth():
     """Get Jenkins authentication credentials from environment.
@@ -61,13 +134,12 @@ def get_jenkins_auth():
     if not token:
         missing.append("JENKINS_TOKEN")
     if missing:
-        print(
+        log(
             f"Error: Required environment variable(s) not set: {', '.join(missing)}\n"
             "Set them in your .envrc:\n"
             "  export JENKINS_BASE_URL=<value>\n"
             "  export JENKINS_USER=<value>\n"
             "  export JENKINS_TOKEN=<value>",
-            file=sys.stderr,
         )
         sys.exit(1)
     return JENKINS_USER, token
@@ -79,51 +151,519 @@ def make_auth_header(user, token):
     return f"Basic {credentials}"
 
 
-def get_crumb(auth_header):
+# Persistent connections to Jenkins, reused across calls (keep-alive) so each
+# request skips the TCP and TLS handshake. http.client connections are not
+# thread-safe, so each thread keeps its own: {(scheme, host): connection}.
+_jenkins_local = threading.local()
+
+# Transient gateway errors worth retrying for idempotent GETs
+JENKINS_RETRY_STATUSES = {502, 503, 504}
+JENKINS_MAX_ATTEMPTS = 3
+
+# Redirects followed for GETs, as urlopen() did (e.g. http:// -> https://)
+JENKINS_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+JENKINS_MAX_REDIRECTS = 5
+
+# Checks, test failures and triggers all fan out into their own thread
+# pools; cap the requests they have open against the Jenkins master
+# together rather than per pool.
+JENKINS_MAX_CONCURRENCY = 8
+_jenkins_slots = threading.BoundedSemaphore(JENKINS_MAX_CONCURRENCY)
+
+# Checks analyzed concurrently. A dry run issues no POSTs, so it can afford
+# more workers than a run that retriggers builds.
+LIVE_RUN_WORKERS = 8
+DRY_RUN_WORKERS = 16
+
+
+def _jenkins_send(url, method, data, headers, timeout):
+    """Send one request over this thread's connection to the URL's host.
+
+    Raises:
+        urllib.error.URLError if Jenkins could not be reached, TimeoutError
+        on a timeout.
+    """
+    parsed = urlparse(url)
+    key = (parsed.scheme, parsed.netloc)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    conns = _jenkins_local.__dict__.setdefault("conns", {})
+
+    # Anything but a GET may change state on Jenkins and must never be sent
+    # twice, so it always gets a fresh connection and no resend.
+    if method != "GET":
+        _drop_jenkins_connection(url)
+
+    # A reused keep-alive connection may have been closed by the server
+    # while idle; reconnect and resend once before treating it as a network
+    # error. A timeout means Jenkins may still be working on the request,
+    # so it is never resent.
+    for attempt in range(2):
+        conn = conns.get(key)
+        reused = conn is not None
+        if conn is None:
+            conn_class = (
+                http.client.HTTPSConnection
+                if parsed.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = conn_class(parsed.netloc, timeout=timeout)
+            conns[key] = conn
+        elif conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        conn.timeout = timeout
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            return conn.getresponse()
+        except TimeoutError:
+            conn.close()
+            del conns[key]
+            raise
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            del conns[key]
+            if attempt or not reused:
+                raise urllib.error.URLError(e)
+
+
+def read_body(resp):
+    """Read a response body, decompressing it if it was sent gzip-encoded.
+
+    Requests that advertise Accept-Encoding: gzip read their body with this
+    instead of resp.read().
+    """
+    raw = resp.read()
+    if resp.headers.get("Content-Encoding") == "gzip":
+        raw = gzip.decompress(raw)
+    return raw
+
+
+def _drop_jenkins_connection(url):
+    parsed = urlparse(url)
+    conns = _jenkins_local.__dict__.get("conns", {})
+    conn = conns.pop((parsed.scheme, parsed.netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+@contextlib.contextmanager
+def jenkins_open(url, headers, method="GET", data=None, timeout=30):
+    """Open a Jenkins URL over a persistent connection.
+
+    A drop-in for urllib.request.urlopen() in the Jenkins helpers: yields
+    the response, raises the same exceptions, and retries GETs that hit a
+    transient 502/503/504. GETs follow up to JENKINS_MAX_REDIRECTS
+    redirects; other methods get the 3xx response itself. At most
+    JENKINS_MAX_CONCURRENCY requests are in flight at once across threads.
+
+    Raises:
+        urllib.error.HTTPError on 4xx/5xx responses (and on a GET that ends
+        in a redirect), urllib.error.URLError if Jenkins could not be
+        reached, TimeoutError on a timeout.
+    """
+    with _jenkins_slots:
+        attempts = JENKINS_MAX_ATTEMPTS if method == "GET" else 1
+        for _ in range(JENKINS_MAX_REDIRECTS + 1):
+            for attempt in range(attempts):
+                resp = _jenkins_send(url, method, data, headers, timeout)
+                if (resp.status not in JENKINS_RETRY_STATUSES
+                        or attempt + 1 == attempts):
+                    break
+                resp.read()
+                time.sleep(0.3 * 2 ** attempt)
+
+            location = resp.getheader("Location")
+            if (method != "GET" or not location
+                    or resp.status not in JENKINS_REDIRECT_STATUSES):
+                break
+            resp.read()
+            url = urljoin(url, location)
+
+        if resp.status >= 400 or (method == "GET" and resp.status >= 300):
+            raise urllib.error.HTTPError(
+                url, resp.status, resp.reason, resp.headers, io.BytesIO(resp.read())
+            )
+
+        try:
+            yield resp
+        finally:
+            # The connection can only be reused once the body was read in full
+            if not resp.isclosed():
+                _drop_jenkins_connection(url)
+
+
+# Jenkins crumbs stay valid for a while, so reuse one across runs instead of
+# fetching it before every trigger: {"<base url> <user>": {...}}
+JENKINS_CRUMB_FILE = os.path.join(CACHE_DIR, "jenkins-crumb.json")
+JENKINS_CRUMB_TTL = 600
+CRUMB_TREE = "crumbRequestField,crumb"
+_crumb_lock = threading.Lock()
+
+
+def _load_crumbs():
+    try:
+        with open(JENKINS_CRUMB_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_crumb(key, crumb_field, crumb):
+    crumbs = _load_crumbs()
+    crumbs[key] = {
+        "crumb_field": crumb_field,
+        "crumb": crumb,
+        "fetched_at": time.time(),
+    }
+    tmp_path = f"{JENKINS_CRUMB_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(crumbs, f)
+        os.replace(tmp_path, JENKINS_CRUMB_FILE)
+    except OSError:
+        pass
+
+
+def get_crumb(auth_header, refresh=False):
     """Fetch Jenkins CSRF crumb for POST requests.
 
+    A crumb fetched in the last JENKINS_CRUMB_TTL seconds for the same
+    Jenkins and user is reused from disk unless refresh is set.
+
     Returns:
         dict with crumb header name and value, or None if crumbs are disabled.
     """
-    url = f"{JENKINS_BASE_URL}/crumbIssuer/api/json"
-    req = urllib.request.Request(
-        url,
-        headers={"Authorization": auth_header},
-    )
+    key = f"{JENKINS_BASE_URL} {JENKINS_USER}"
+    with _crumb_lock:
+        if not refresh:
+            cached = _load_crumbs().get(key)
+            if cached and time.time() - cached.get("fetched_at", 0) < JENKINS_CRUMB_TTL:
+                return {cached["crumb_field"]: cached["crumb"]}
+
+        # tree= limits the response to the two fields read below
+        url = (
+            f"{JENKINS_BASE_URL}/crumbIssuer/api/json"
+            f"?tree={CRUMB_TREE}"
+        )
+        try:
+            with jenkins_open(
+                url, {"Authorization": auth_header}, timeout=15
+            ) as resp:
+                data = _json_loads(resp.read())
+                crumb_field, crumb = data["crumbRequestField"], data["crumb"]
+        except (urllib.error.HTTPError, urllib.error.URLError, TimeoutError,
+                KeyError):
+            # Crumb issuer may be disabled; proceed without it
+            return None
+
+        _save_crumb(key, crumb_field, crumb)
+        return {crumb_field: crumb}
+
+
+# ---------------------------------------------------------------------------
+# GitHub API helpers
+# ---------------------------------------------------------------------------
+
+# Persistent connections to api.github.com, reused across calls (keep-alive).
+# http.client connections are not thread-safe, so each thread keeps its own.
+_github_local = threading.local()
+
+# ETag store for conditional GitHub GETs:
+# {path: {"etag", "link", "body", "used_at"}}. 304 Not Modified responses
+# do not count against the API rate limit. It is loaded on first use and
+# written once, at exit, keeping only the GITHUB_ETAGS_MAX_ENTRIES most
+# recently used entries from the last GITHUB_ETAGS_MAX_AGE seconds.
+# Search queries rarely repeat, so their responses are not stored.
+GITHUB_ETAGS_FILE = os.path.join(CACHE_DIR, "gh-etags.json")
+GITHUB_ETAGS_MAX_ENTRIES = 200
+GITHUB_ETAGS_MAX_AGE = 7 * 24 * 3600
+_github_etags = None
+_github_etags_dirty = False
+_github_etags_lock = threading.Lock()
+
+
+def _load_github_etags():
+    global _github_etags
+    if _github_etags is None:
+        try:
+            with open(GITHUB_ETAGS_FILE) as f:
+                _github_etags = json.load(f)
+        except (OSError, ValueError):
+            _github_etags = {}
+    return _github_etags
+
+
+def _save_github_etag(path, etag, link, body):
+    """Remember the ETag and body of a GitHub GET response."""
+    global _github_etags_dirty
+    if path.startswith("/search/"):
+        return
+    with _github_etags_lock:
+        _load_github_etags()[path] = {
+            "etag": etag,
+            "link": link,
+            "body": body.decode("utf-8"),
+            "used_at": time.time(),
+        }
+        _github_etags_dirty = True
+
+
+def _touch_github_etag(entry):
+    """Mark a stored response as used, so pruning keeps it."""
+    global _github_etags_dirty
+    with _github_etags_lock:
+        entry["used_at"] = time.time()
+        _github_etags_dirty = True
+
+
+def save_github_etags():
+    """Write the ETag store to disk if it changed, dropping stale entries."""
+    global _github_etags_dirty
+    with _github_etags_lock:
+        if not _github_etags_dirty:
+            return
+        cutoff = time.time() - GITHUB_ETAGS_MAX_AGE
+        recent = sorted(
+            (
+                item for item in _github_etags.items()
+                if item[1].get("used_at", 0) >= cutoff
+            ),
+            key=lambda item: item[1]["used_at"],
+            reverse=True,
+        )
+        etags = dict(recent[:GITHUB_ETAGS_MAX_ENTRIES])
+        tmp_path = f"{GITHUB_ETAGS_FILE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(etags, f)
+            os.replace(tmp_path, GITHUB_ETAGS_FILE)
+        except OSError:
+            pass
+        _github_etags_dirty = False
+
+
+def github_request(path, method="GET", body=None, timeout=30):
+    """Make a request to the GitHub API over a persistent HTTPS connection.
+
+    GET requests are conditional: the last ETag seen for the path is sent
+    as If-None-Match, and the stored body is reused on 304 Not Modified.
+
+    Args:
+        path: Request path including query string (e.g., "/repos/o/r/pulls/1").
+        method: HTTP method.
+        body: Optional dict to send as a JSON request body.
+
+    Returns:
+        Tuple of (parsed JSON response, response headers).
+
+    Raises:
+        urllib.error.HTTPError on non-2xx responses, urllib.error.URLError
+        if GitHub could not be reached.
+    """
+    headers = {
+        "Authorization": f"Bearer {GH_TOKEN}",
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "brave-core-tools",
+        "Accept-Encoding": "gzip",
+    }
+    data = None
+    if body is not None:
+        data = _json_dumps_bytes(body)
+        headers["Content-Type"] = "application/json"
+
+    cached = None
+    if method == "GET":
+        with _github_etags_lock:
+            cached = _load_github_etags().get(path)
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
+
+    # A keep-alive connection may have been closed by the server since the
+    # last call; reconnect once before treating it as a network error.
+    for attempt in range(2):
+        conn = getattr(_github_local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(GITHUB_API_HOST, timeout=timeout)
+            _github_local.conn = conn
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = read_body(resp)
+            break
+        except (http.client.HTTPException, OSError, EOFError) as e:
+            conn.close()
+            _github_local.conn = None
+            if attempt:
+                raise urllib.error.URLError(e)
+
+    if resp.status == 304 and cached:
+        _touch_github_etag(cached)
+        return _json_loads(cached["body"]), {"Link": cached["link"]}
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            f"https://{GITHUB_API_HOST}{path}", resp.status, resp.reason,
+            resp.headers, io.BytesIO(raw),
+        )
+
+    etag = resp.headers.get("ETag")
+    if method == "GET" and etag:
+        _save_github_etag(path, etag, resp.headers.get("Link") or "", raw)
+    return (_json_loads(raw) if raw else None), resp.headers
+
+
+def github_paginate(path):
+    """Yield each page of a paginated GitHub REST response.
+
+    Follows the rel="next" URL from the Link header until exhausted.
+    """
+    while path:
+        data, headers = github_request(path)
+        yield data
+
+        path = None
+        for link in (headers.get("Link") or "").split(","):
+            url, _, rel = link.partition(";")
+            if 'rel="next"' in rel:
+                next_url = urlparse(url.strip().strip("<>"))
+                path = f"{next_url.path}?{next_url.query}"
+                break
+
+
+# Cache for combined PR metadata (head SHA, check rollup, changed files)
+_pr_bundle_cache = {}
+
+# Guards _pr_bundle_cache and _pr_files_cache, which are shared by the
+# per-check worker threads.
+_pr_cache_lock = threading.RLock()
+
+PR_BUNDLE_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      headRefOid
+      commits(last: 1) {
+        nodes {
+          commit {
+            statusCheckRollup {
+              contexts(first: 100) {
+                nodes {
+                  ... on CheckRun { name status conclusion detailsUrl }
+                  ... on StatusContext { context state targetUrl }
+                }
+              }
+            }
+          }
+        }
+      }
+      files(first: 100) {
+        pageInfo { hasNextPage }
+        nodes { path }
+      }
+    }
+  }
+}
+"""
+
+
+def _graphql_pr_bundle(pr_number):
+    """Fetch PR metadata with a single GraphQL query. Returns None on error."""
+    owner, name = GITHUB_REPO.split("/")
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read())
-            return {data["crumbRequestField"]: data["crumb"]}
-    except (urllib.error.HTTPError, urllib.error.URLError, KeyError):
-        # Crumb issuer may be disabled; proceed without it
+        data, _ = github_request("/graphql", method="POST", body={
+            "query": PR_BUNDLE_QUERY,
+            "variables": {"owner": owner, "name": name, "number": pr_number},
+        })
+    except (urllib.error.HTTPError, urllib.error.URLError) as e:
+        log(f"Error: Failed to get PR checks: {e}")
         return None
 
+    pr = ((data or {}).get("data") or {}).get("repository", {}).get("pullRequest")
+    if not pr:
+        errors = (data or {}).get("errors") or "pull request not found"
+        log(f"Error: Failed to get PR checks: {errors}")
+        return None
+
+    rollup = []
+    commits = pr.get("commits", {}).get("nodes", [])
+    if commits:
+        status_rollup = commits[-1].get("commit", {}).get("statusCheckRollup") or {}
+        rollup = status_rollup.get("contexts", {}).get("nodes", [])
+
+    files = pr.get("files") or {}
+    return {
+        "head_sha": pr.get("headRefOid"),
+        "status_check_rollup": rollup,
+        "files": [f.get("path", "") for f in files.get("nodes", [])],
+        "files_truncated": files.get("pageInfo", {}).get("hasNextPage", False),
+    }
+
+
+def _gh_pr_bundle(pr_number):
+    """Fetch PR metadata with a single gh pr view call. Returns None on error."""
+    try:
+        result = subprocess.run(
+            [
+                "gh", "pr", "view", str(pr_number),
+                "--repo", GITHUB_REPO,
+                "--json", "headRefOid,statusCheckRollup,files",
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        if result.returncode != 0:
+            log(f"Error: Failed to get PR checks: {result.stderr}")
+            return None
+        data = _json_loads(result.stdout)
+    except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
+        log(f"Error: Failed to get PR checks: {e}")
+        return None
+
+    return {
+        "head_sha": data.get("headRefOid"),
+        "status_check_rollup": data.get("statusCheckRollup", []),
+        "files": [f.get("path", "") for f in data.get("files", [])],
+        "files_truncated": False,
+    }
+
+
+def fetch_pr_bundle(pr_number):
+    """Fetch the PR head SHA, status check rollup, and changed files at once.
+
+    Uses one GraphQL query when GH_TOKEN is set, otherwise one gh pr view
+    call. Results are cached.
+
+    Returns:
+        Dict with keys: head_sha, status_check_rollup, files, files_truncated;
+        or None on error.
+    """
+    with _pr_cache_lock:
+        if pr_number in _pr_bundle_cache:
+            return _pr_bundle_cache[pr_number]
+
+        if GH_TOKEN:
+            bundle = _graphql_pr_bundle(pr_number)
+        else:
+            bundle = _gh_pr_bundle(pr_number)
+
+        _pr_bundle_cache[pr_number] = bundle
+        return bundle
+
 
 def get_failing_checks(pr_number):
     """Query GitHub for PR check statuses.
 
-    Uses gh api to fetch commit statuses for the PR's head SHA, which is
-    compatible with all versions of the gh CLI.
+    Reads the statusCheckRollup from the cached PR bundle, which is fetched
+    via the GitHub GraphQL API when GH_TOKEN is set, otherwise via gh.
 
     Returns:
         list of dicts with keys: name, state, link, is_jenkins
     """
-    # Step 1: Get the PR's head commit SHA
-    result = subprocess.run(
-        [
-            "gh", "pr", "view", str(pr_number),
-            "--repo", "brave/brave-core",
-            "--json", "statusCheckRollup",
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        print(f"Error: Failed to get PR checks: {result.stderr}", file=sys.stderr)
+    bundle = fetch_pr_bundle(pr_number)
+    if bundle is None:
         sys.exit(2)
-
-    data = json.loads(result.stdout)
-    rollup = data.get("statusCheckRollup", [])
+    rollup = bundle["status_check_rollup"]
 
     # Map GitHub API states to our internal states
     state_map = {
@@ -140,8 +680,7 @@ def get_failing_checks(pr_number):
         "COMPLETED": None,  # need to check conclusion
     }
 
-    results = []
-    seen = set()
+    results_by_name = {}
     jenkins_host = urlparse(JENKINS_BASE_URL).hostname or ""
 
     for entry in rollup:
@@ -163,25 +702,27 @@ def get_failing_checks(pr_number):
 
         # Deduplicate: keep the latest status for each check name
         # (GitHub returns all statuses, we want the most recent)
-        if name in seen:
+        existing = results_by_name.get(name)
+        if existing is not None:
             # Update existing entry if this one is newer (later in the list)
-            for r in results:
-                if r["name"] == name:
-                    r["state"] = state
-                    r["link"] = link
-                    break
+            existing["state"] = state
+            existing["link"] = link
             continue
 
-        seen.add(name)
         is_jenkins = bool(jenkins_host and jenkins_host in link)
-        results.append({
+        results_by_name[name] = {
             "name": name,
             "state": state,
             "link": link,
             "is_jenkins": is_jenkins,
-        })
+        }
 
-    return results
+    return list(results_by_name.values())
+
+
+# /job/<job-name>/job/<branch>[/<build-number>], optionally followed by more
+# segments such as display/redirect, under any Jenkins context path
+_JENKINS_URL_RE = re.compile(r"/job/([^/]+)/job/([^/]+)(?:/(\d+))?(?:/|$)")
 
 
 def parse_jenkins_url(link):
@@ -190,63 +731,104 @@ def parse_jenkins_url(link):
     Example input: https://<jenkins>/job/brave-core-build-pr-linux-x64/job/PR-33936/2/
     Returns: ("brave-core-build-pr-linux-x64", "PR-33936", "2")
     """
-    parsed = urlparse(link)
-    path = parsed.path.rstrip("/")
-    parts = path.split("/")
-
-    # Expected: /job/<job-name>/job/<branch>/<build-number>
-    # parts: ['', 'job', 'brave-core-build-pr-linux-x64', 'job', 'PR-33936', '2']
-    job_name = None
-    branch = None
-    build_number = None
-
-    i = 0
-    while i < len(parts):
-        if parts[i] == "job" and i + 1 < len(parts):
-            if job_name is None:
-                job_name = parts[i + 1]
-            else:
-                branch = parts[i + 1]
-            i += 2
-        else:
-            # The last segment after job/branch is the build number
-            if branch is not None and parts[i]:
-                build_number = parts[i]
-            i += 1
+    m = _JENKINS_URL_RE.search(urlparse(link).path)
+    if not m:
+        return None, None, None
+    return m.groups()
+
 
-    return job_name, branch, build_number
+def _cache_path(key):
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(BUILD_CACHE_DIR, f"{digest}.gz")
+
+
+def _cache_get(key):
+    """Return cached bytes for key, or None on a cache miss."""
+    try:
+        with gzip.open(_cache_path(key), "rb") as f:
+            return f.read()
+    except (OSError, EOFError):
+        return None
+
+
+def _cache_put(key, data):
+    """Store bytes for key. Cache write failures are not fatal."""
+    path = _cache_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(BUILD_CACHE_DIR, exist_ok=True)
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(data)
+        # Atomic rename so concurrent runs never read a partial entry
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _build_cache_key(job, branch, build, endpoint):
+    return f"{JENKINS_BASE_URL}/job/{job}/job/{branch}/{build}/{endpoint}"
+
+
+def _is_finished_build(job, branch, build):
+    """Return True if get_failed_stage() saw this build in a final state.
+
+    Stage info is only cached once a build has finished, so a cache entry
+    doubles as the marker that the build's other outputs are immutable.
+    """
+    key = _build_cache_key(job, branch, build, "wfapi/describe")
+    return os.path.exists(_cache_path(key))
 
 
 def get_failed_stage(job, branch, build, auth_header):
     """Query Jenkins API for the failed pipeline stage.
 
+    Responses for finished builds are cached on disk.
+
     Returns:
         The name of the first failed stage, or None if not determinable.
     """
+    cache_key = _build_cache_key(job, branch, build, "wfapi/describe")
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return _first_failed_stage(_json_loads(cached))
+
     url = (
         f"{JENKINS_BASE_URL}/job/{job}/job/{branch}/{build}/wfapi/describe"
     )
-    req = urllib.request.Request(
-        url,
-        headers={"Authorization": auth_header},
-    )
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read())
+        with jenkins_open(
+            url, {"Authorization": auth_header, "Accept-Encoding": "gzip"}
+        ) as resp:
+            raw = read_body(resp)
+            data = _json_loads(raw)
     except urllib.error.HTTPError as e:
-        print(
+        log(
             f"  Warning: Jenkins API returned HTTP {e.code} for {job}/{branch}/{build}",
-            file=sys.stderr,
         )
         return None
     except urllib.error.URLError as e:
-        print(
+        log(
             f"  Warning: Could not reach Jenkins API: {e.reason}",
-            file=sys.stderr,
         )
         return None
+    except TimeoutError:
+        log(
+            f"  Warning: Jenkins API timed out for {job}/{branch}/{build}",
+        )
+        return None
+
+    if build and data.get("status") in FINISHED_BUILD_STATUSES:
+        _cache_put(cache_key, raw)
+
+    return _first_failed_stage(data)
+
 
-    # wfapi/describe returns {"stages": [{"name": "...", "status": "..."}]}
+def _first_failed_stage(data):
+    """Return the name of the first failed stage in a wfapi/describe response."""
+    # wfapi/describe returns {"stages": [{"name": "...", "status": "..."}]}.
+    # It is a pipeline-stage-view endpoint, which ignores the tree= and
+    # depth= filters of the standard api/json, but it only lists top-level
+    # stages without their flow nodes, so it is already small.
     stages = data.get("stages", [])
     for stage in stages:
         if stage.get("status") in ("FAILED", "ABORTED"):
@@ -264,12 +846,9 @@ def decide_action(stage_name):
     if stage_name is None:
         return False, "Could not determine failed stage; defaulting to normal re-run"
 
-    stage_lower = stage_name.lower()
-
     # Check if the stage name contains any WIPE_WORKSPACE keywords
-    for keyword in WIPE_WORKSPACE_KEYWORDS:
-        if keyword in stage_lower:
-            return True, f"Pre-test stage failure: \"{stage_name}\" -> WIPE_WORKSPACE"
+    if _WIPE_RE.search(stage_name.lower()):
+        return True, f"Pre-test stage failure: \"{stage_name}\" -> WIPE_WORKSPACE"
 
     return False, f"Test/post-build stage failure: \"{stage_name}\" -> normal re-run"
 
@@ -278,7 +857,7 @@ def decide_action(stage_name):
 # Test failure analysis helpers
 # ---------------------------------------------------------------------------
 
-# Cache for PR changed files (avoids redundant gh calls)
+# Cache for PR changed files (avoids redundant GitHub calls)
 _pr_files_cache = {}
 
 
@@ -286,11 +865,7 @@ def is_test_stage(stage_name):
     """Return True if the failed stage is a test/post-build stage."""
     if stage_name is None:
         return False
-    stage_lower = stage_name.lower()
-    for keyword in WIPE_WORKSPACE_KEYWORDS:
-        if keyword in stage_lower:
-            return False
-    return True
+    return not _WIPE_RE.search(stage_name.lower())
 
 
 def extract_platform_from_job(job_name):
@@ -310,198 +885,360 @@ def extract_platform_from_job(job_name):
 def fetch_console_tail(job, branch, build, auth_header, tail_bytes=500_000):
     """Fetch the tail of Jenkins console output for a build.
 
-    Uses an HTTP Range header to avoid downloading the entire log.
+    Uses an HTTP Range header to avoid downloading the entire log. The
+    console of a finished build is cached on disk.
 
     Returns:
-        Console text string, or empty string on failure.
+        List of console lines, or an empty list on failure.
     """
+    cache_key = _build_cache_key(job, branch, build, f"consoleText?tail={tail_bytes}")
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached.decode("utf-8").split("\n")
+
+    console_lines = _fetch_console_tail(job, branch, build, auth_header, tail_bytes)
+    if console_lines and _is_finished_build(job, branch, build):
+        _cache_put(cache_key, "\n".join(console_lines).encode("utf-8"))
+    return console_lines
+
+
+def _read_console_lines(stream, chunk_size=65536):
+    """Yield decoded lines from a binary stream as chunks arrive.
+
+    Decoding and line splitting overlap with the download instead of
+    waiting for the whole body and then copying it into one big string.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    carry = ""
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        text = carry + decoder.decode(chunk)
+        lines = text.split("\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    carry += decoder.decode(b"", final=True)
+    if carry:
+        yield carry.rstrip("\r")
+
+
+def _fetch_console_tail(job, branch, build, auth_header, tail_bytes):
     url = f"{JENKINS_BASE_URL}/job/{job}/job/{branch}/{build}/consoleText"
     headers = {"Authorization": auth_header}
-    # Request only the last tail_bytes
+    # Request only the last tail_bytes. This request stays uncompressed:
+    # a Range over a gzip-encoded body would be a slice of the compressed
+    # stream, which can't be decoded on its own.
     headers["Range"] = f"bytes=-{tail_bytes}"
 
-    req = urllib.request.Request(url, headers=headers)
     try:
-        with urllib.request.urlopen(req, timeout=60) as resp:
-            return resp.read().decode("utf-8", errors="replace")
+        with jenkins_open(url, headers, timeout=60) as resp:
+            return list(_read_console_lines(resp))
     except urllib.error.HTTPError as e:
         if e.code == 416:
-            # Range not satisfiable — log is smaller than tail_bytes, fetch all
+            # Range not satisfiable — log is smaller than tail_bytes, fetch
+            # all of it. Without a Range there is no byte offset to honour,
+            # so let Jenkins gzip the log; build logs compress 10-20x.
             try:
-                req2 = urllib.request.Request(
-                    url, headers={"Authorization": auth_header}
-                )
-                with urllib.request.urlopen(req2, timeout=60) as resp:
-                    return resp.read().decode("utf-8", errors="replace")
-            except (urllib.error.HTTPError, urllib.error.URLError):
-                return ""
-        print(
+                with jenkins_open(
+                    url,
+                    {"Authorization": auth_header, "Accept-Encoding": "gzip"},
+                    timeout=60,
+                ) as resp:
+                    if resp.headers.get("Content-Encoding") == "gzip":
+                        with gzip.GzipFile(fileobj=resp) as gz:
+                            return list(_read_console_lines(gz))
+                    return list(_read_console_lines(resp))
+            except (urllib.error.HTTPError, urllib.error.URLError, OSError, EOFError):
+                return []
+        log(
             f"  Warning: Jenkins console returned HTTP {e.code}",
-            file=sys.stderr,
         )
-        return ""
+        return []
     except urllib.error.URLError as e:
-        print(
+        log(
             f"  Warning: Could not fetch console output: {e.reason}",
-            file=sys.stderr,
         )
-        return ""
+        return []
+    except TimeoutError:
+        log(
+            "  Warning: Timed out fetching console output",
+        )
+        return []
+
 
+# GTest markers that open and close a test's output block. The FAILED
+# marker also makes up the summary of failing tests at the end of the run.
+_GTEST_RUN_MARKER = "[ RUN      ]"
+_GTEST_RUN_PREFIX = _GTEST_RUN_MARKER + " "
+_GTEST_FAILED_RE = re.compile(r"^\[\s+FAILED\s+\]\s+(\S+)")
 
-def extract_test_failures(console_text):
-    """Parse GTest output from console text to find failing tests.
+
+def extract_test_failures(console_lines):
+    """Parse GTest output from console lines to find failing tests.
 
     Looks for the GTest summary section (lines starting with [  FAILED  ])
-    and extracts the test output block for each failing test.
+    and extracts the test output block for each failing test. The log is
+    scanned once, recording where each test's [ RUN      ] and
+    [  FAILED  ] markers are, and trace blocks are then sliced by index.
+
+    The scan always runs to the end of the log: the summary printed there
+    is the only complete list of failing tests, so no earlier point is
+    known to be safe to stop at.
+
+    Args:
+        console_lines: Iterable of console lines, or the console text.
 
     Returns:
         List of dicts with keys: test_name, stack_trace
     """
-    lines = console_text.split("\n")
+    if isinstance(console_lines, str):
+        console_lines = console_lines.splitlines()
+    lines = []
 
-    # 1. Find all failing test names from the summary section.
-    #    GTest prints a summary like:
-    #    [  FAILED  ] TestSuite.TestMethod (123 ms)
-    #    at the very end after "X test(s) failed".
-    summary_re = re.compile(r"^\[\s+FAILED\s+\]\s+(\S+)")
+    # GTest prints a summary like:
+    #   [  FAILED  ] TestSuite.TestMethod (123 ms)
+    # at the very end after "X test(s) failed", and the same marker closes
+    # each failing test's output block, which opens with
+    #   [ RUN      ] TestSuite.TestMethod
     failing_names = []
     seen = set()
-    for line in lines:
-        m = summary_re.match(line.strip())
+    run_lines = {}
+    fail_lines = {}
+    for i, line in enumerate(console_lines):
+        lines.append(line)
+        # Nearly every line is neither marker; reject those with substring
+        # checks before paying for strip() and the regex.
+        if _GTEST_RUN_MARKER not in line and "FAILED" not in line:
+            continue
+        stripped = line.strip()
+        if stripped.startswith(_GTEST_RUN_PREFIX):
+            name = stripped[len(_GTEST_RUN_PREFIX):].split(None, 1)[0]
+            run_lines.setdefault(name, i)
+            continue
+        m = _GTEST_FAILED_RE.match(stripped)
         if m:
             name = m.group(1).rstrip(",")
             if name not in seen:
                 seen.add(name)
                 failing_names.append(name)
+            # The first [  FAILED  ] after the test started ends its block.
+            if name in run_lines and name not in fail_lines:
+                fail_lines[name] = i
 
-    if not failing_names:
-        return []
-
-    # 2. For each failing test, extract its output block between
-    #    [ RUN      ] TestName and [  FAILED  ] TestName
     results = []
     for test_name in failing_names:
-        run_marker = f"[ RUN      ] {test_name}"
-        fail_marker = f"[  FAILED  ] {test_name}"
-
-        trace_lines = []
-        capturing = False
-        for line in lines:
-            stripped = line.strip()
-            if not capturing and run_marker in stripped:
-                capturing = True
-                continue
-            if capturing:
-                if fail_marker in stripped:
-                    break
-                trace_lines.append(line)
-
-        # Limit stack trace length
-        stack_trace = "\n".join(trace_lines[-50:]) if trace_lines else ""
+        run_index = run_lines.get(test_name)
+        if run_index is None:
+            trace_lines = []
+        else:
+            end = fail_lines.get(test_name, len(lines))
+            # Limit stack trace length
+            trace_lines = lines[max(run_index + 1, end - 50):end]
         results.append({
             "test_name": test_name,
-            "stack_trace": stack_trace,
+            "stack_trace": "\n".join(trace_lines),
         })
 
     return results
 
 
 def _resolve_src_dir():
-    """Resolve the path to the chromium src directory relative to this script.
+    """Return the path to the chromium src directory (see SRC_DIR)."""
+    return SRC_DIR
 
-    The script is at: brave-core-tools/.claude/skills/make-ci-green/retrigger-ci.py
-    The src dir is at: src/ (4 levels up from the script)
-    """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.normpath(os.path.join(script_dir, "..", "..", "..", "..", "src"))
+
+# Cache for locate_tests results (many failing tests share a class)
+_locate_test_cache = {}
+
+# Serializes source scans so concurrent checks do not rescan the tree for
+# classes another check is already locating.
+_locate_test_lock = threading.Lock()
+
+# Sources likely to define test fixtures (git pathspec globs also match "/")
+TEST_SOURCE_PATHSPEC = ("*test*.cc", "*test*.h", "*test*.mm")
 
 
-def find_test_location(test_class_name):
-    """Determine if a test is a Brave test or Chromium test.
+def _scan_test_sources(test_class_names, cwd, pathspec):
+    """Find which tracked test sources under cwd mention each class name.
 
-    Runs git grep in src/brave/ first, then in src/ (excluding brave/).
+    One git grep (which searches on several threads) lists the files that
+    contain any of the names, instead of running one git grep per name;
+    only those few files are then read to tell the names apart. If the
+    search fails or takes over 30 seconds, no files are reported.
 
     Returns:
-        'brave', 'chromium', or 'unknown'
+        Dict of {class_name: [paths relative to cwd]}.
     """
-    src_dir = _resolve_src_dir()
-    brave_dir = os.path.join(src_dir, "brave")
-
-    # Check src/brave/ first
+    hits = {name: [] for name in test_class_names}
+    patterns = []
+    for name in test_class_names:
+        patterns += ["-e", name]
     try:
         result = subprocess.run(
-            ["git", "grep", "-l", test_class_name],
-            cwd=brave_dir,
+            ["git", "grep", "-l", "-I", "-z", "-F", *patterns,
+             "--", *pathspec],
+            cwd=cwd,
             capture_output=True,
-            text=True,
             timeout=30,
         )
-        if result.returncode == 0 and result.stdout.strip():
-            return "brave"
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return hits
+    if result.returncode != 0:
+        # 1 means no file matched
+        return hits
 
-    # Check src/ excluding brave/
-    try:
-        result = subprocess.run(
-            ["git", "grep", "-l", test_class_name, "--", ".", ":!brave"],
-            cwd=src_dir,
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return "chromium"
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    needles = [(name, name.encode()) for name in test_class_names]
+    for rel_path in result.stdout.split(b"\0"):
+        if not rel_path:
+            continue
+        if len(needles) == 1:
+            hits[needles[0][0]].append(os.fsdecode(rel_path))
+            continue
+        try:
+            with open(os.path.join(cwd, os.fsdecode(rel_path)), "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        for name, needle in needles:
+            if needle in data:
+                hits[name].append(os.fsdecode(rel_path))
 
-    return "unknown"
+    return hits
 
 
-def get_test_source_files(test_class_name):
-    """Find source files containing a test class.
+def locate_tests(test_class_names):
+    """Determine where tests live and which source files contain them.
+
+    src/brave/ is a separate git checkout from chromium's src/, so the test
+    sources of each (src/brave/ and src/ excluding brave/) are scanned once
+    for all requested classes. Results are cached per test class.
 
     Returns:
-        List of file paths relative to src/ (e.g., ['brave/browser/test.cc',
-        'chrome/browser/test.cc']).
+        Dict of {class_name: (location, files)}. location is 'brave',
+        'chromium', or 'unknown'; files are paths relative to src/ (e.g.,
+        ['brave/browser/test.cc', 'chrome/browser/test.cc']).
     """
-    src_dir = _resolve_src_dir()
-    files = []
-
-    try:
-        result = subprocess.run(
-            ["git", "grep", "-l", test_class_name],
-            cwd=src_dir,
-            capture_output=True,
-            text=True,
-            timeout=30,
+    with _locate_test_lock:
+        pending = sorted(
+            {name for name in test_class_names if name not in _locate_test_cache}
         )
-        if result.returncode == 0 and result.stdout.strip():
-            files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        if pending:
+            src_dir = _resolve_src_dir()
+            brave_hits = _scan_test_sources(
+                pending, os.path.join(src_dir, "brave"), TEST_SOURCE_PATHSPEC
+            )
+            chromium_hits = _scan_test_sources(
+                pending, src_dir, TEST_SOURCE_PATHSPEC + (":!brave",)
+            )
+
+            for name in pending:
+                brave_files = [f"brave/{f}" for f in brave_hits[name]]
+                chromium_files = chromium_hits[name]
+                if brave_files:
+                    location = "brave"
+                elif chromium_files:
+                    location = "chromium"
+                else:
+                    location = "unknown"
+                _locate_test_cache[name] = (location, brave_files + chromium_files)
+
+        return {name: _locate_test_cache[name] for name in test_class_names}
+
+
+def locate_test(test_class_name):
+    """Locate a single test class. See locate_tests()."""
+    return locate_tests([test_class_name])[test_class_name]
+
+
+# check-upstream-flake.py loaded as a module, or False if it can't be
+_flake_module = None
+_flake_module_lock = threading.Lock()
+
+# Each flake check runs several multi-page LUCI Analysis conversations, and
+# checks are started from nested thread pools; cap how many run at once
+# across threads. A check gets FLAKE_CHECK_TIMEOUT seconds, as the
+# subprocess did, counting the wait for a slot.
+FLAKE_MAX_CONCURRENCY = 4
+FLAKE_CHECK_TIMEOUT = 60
+_flake_slots = threading.BoundedSemaphore(FLAKE_MAX_CONCURRENCY)
+
 
-    return files
+def _load_flake_module():
+    """Import check-upstream-flake.py once. Returns None if unavailable."""
+    global _flake_module
+    with _flake_module_lock:
+        if _flake_module is None:
+            try:
+                spec = importlib.util.spec_from_file_location(
+                    "check_upstream_flake", FLAKE_SCRIPT
+                )
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                _flake_module = module if hasattr(module, "check_test") else False
+            except (OSError, SyntaxError, ImportError) as e:
+                log(
+                    f"  Warning: Could not import check-upstream-flake.py: {e}",
+                )
+                _flake_module = False
+        return _flake_module or None
 
 
 def check_upstream_flake(test_name):
-    """Run check-upstream-flake.py for a Chromium test.
+    """Check a Chromium test with check-upstream-flake.py.
+
+    The checker is imported and run in process so each test does not pay
+    for a Python startup. Falls back to running it as a subprocess if it
+    can't be imported.
 
     Returns:
         Dict with verdict info, or None on error.
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    flake_script = os.path.normpath(
-        os.path.join(script_dir, "..", "..", "..", "scripts", "check-upstream-flake.py")
-    )
+    flake_script = FLAKE_SCRIPT
 
     if not os.path.exists(flake_script):
-        print(
+        log(
             f"  Warning: check-upstream-flake.py not found at {flake_script}",
-            file=sys.stderr,
         )
         return None
 
+    module = _load_flake_module()
+    if module is not None:
+        deadline = time.monotonic() + FLAKE_CHECK_TIMEOUT
+        if not _flake_slots.acquire(timeout=FLAKE_CHECK_TIMEOUT):
+            log(f"  Warning: Upstream flake check for {test_name} timed out")
+            return None
+
+        outcome = {}
+
+        def run():
+            # The slot is held until the check really ends, even if the
+            # caller stopped waiting for it
+            try:
+                outcome["results"] = module.check_test(test_name, verbose=False)
+            except SystemExit:
+                # Fatal API error; its message is dropped, as the
+                # subprocess's stderr was
+                pass
+            finally:
+                _flake_slots.release()
+
+        # A daemon thread, so a check that overruns its deadline can't hold
+        # up the exit
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        worker.join(max(0, deadline - time.monotonic()))
+        if worker.is_alive():
+            log(f"  Warning: Upstream flake check for {test_name} timed out")
+            return None
+        if "results" not in outcome:
+            return None
+        test_results = outcome["results"]
+        verdict, recommendation = module.overall_verdict(test_results)
+        return {
+            "verdict": verdict,
+            "recommendation": recommendation,
+            "matched_tests": len(test_results),
+        }
+
     try:
         result = subprocess.run(
             [sys.executable, flake_script, test_name, "--json"],
@@ -511,77 +1248,118 @@ def check_upstream_flake(test_name):
         )
         if result.returncode in (0, 2):
             # 0 = found, 2 = not found (both produce valid JSON)
-            data = json.loads(result.stdout)
+            data = _json_loads(result.stdout)
             return {
                 "verdict": data.get("overall_verdict", "unknown"),
                 "recommendation": data.get("overall_recommendation", ""),
                 "matched_tests": len(data.get("matched_tests", [])),
             }
     except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"  Warning: Upstream flake check failed: {e}", file=sys.stderr)
+        log(f"  Warning: Upstream flake check failed: {e}")
 
     return None
 
 
+def _rest_pr_changed_files(pr_number):
+    """Fetch PR changed files via the REST API. Returns None on error."""
+    try:
+        files = []
+        for page in github_paginate(
+            f"/repos/{GITHUB_REPO}/pulls/{pr_number}/files?per_page=100"
+        ):
+            files.extend(f.get("filename", "") for f in page)
+        return files
+    except (urllib.error.HTTPError, urllib.error.URLError) as e:
+        log(f"  Warning: Could not get PR files: {e}")
+        return None
+
+
+# How long the on-disk list of a PR's changed files is trusted. Short, since
+# new pushes change it, but long enough to cover re-runs during triage.
+PR_FILES_CACHE_TTL = 300
+
+
+def _pr_files_cache_path(pr_number):
+    return os.path.join(CACHE_DIR, f"pr-files-{pr_number}.json")
+
+
+def _load_pr_files(pr_number):
+    """Return the PR's changed files from disk if fresh, else None."""
+    path = _pr_files_cache_path(pr_number)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - data.get("_mtime", 0) > PR_FILES_CACHE_TTL:
+        return None
+    return data.get("files")
+
+
+def _save_pr_files(pr_number, files):
+    """Store the PR's changed files on disk. Write failures are not fatal."""
+    path = _pr_files_cache_path(pr_number)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"_mtime": time.time(), "files": files}, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
 def get_pr_changed_files(pr_number):
-    """Get the list of files changed in a PR. Results are cached.
+    """Get the list of files changed in a PR.
+
+    Results are cached in memory and, for PR_FILES_CACHE_TTL seconds, on
+    disk so that repeated runs against the same PR skip the GitHub lookup.
 
     Returns:
         List of file paths relative to the brave-core repo root.
     """
-    if pr_number in _pr_files_cache:
-        return _pr_files_cache[pr_number]
+    with _pr_cache_lock:
+        if pr_number in _pr_files_cache:
+            return _pr_files_cache[pr_number]
+
+        files = _load_pr_files(pr_number)
+        if files is not None:
+            _pr_files_cache[pr_number] = files
+            return files
+
+        bundle = fetch_pr_bundle(pr_number)
+        if bundle is None:
+            files = None
+        elif bundle["files_truncated"]:
+            # The bundle only carries the first page of files; page through
+            # the full list over REST for large PRs.
+            files = _rest_pr_changed_files(pr_number)
+        else:
+            files = bundle["files"]
 
-    try:
-        result = subprocess.run(
-            [
-                "gh", "pr", "view", str(pr_number),
-                "--repo", "brave/brave-core",
-                "--json", "files",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        if result.returncode != 0:
-            print(
-                f"  Warning: Could not get PR files: {result.stderr.strip()}",
-                file=sys.stderr,
-            )
-            _pr_files_cache[pr_number] = []
-            return []
+        if files is not None:
+            _save_pr_files(pr_number, files)
+        _pr_files_cache[pr_number] = files or []
+        return _pr_files_cache[pr_number]
 
-        data = json.loads(result.stdout)
-        files = [f.get("path", "") for f in data.get("files", [])]
-        _pr_files_cache[pr_number] = files
-        return files
-    except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
-        print(f"  Warning: Error getting PR files: {e}", file=sys.stderr)
-        _pr_files_cache[pr_number] = []
-        return []
 
+def index_pr_files(pr_files):
+    """Precompute the PR file lookups used by assess_pr_correlation().
 
-def assess_pr_correlation(pr_files, test_source_files, test_location):
-    """Determine if a test failure is likely related to PR changes.
+    The PR file list is the same for every failing test, so it is indexed
+    once per run instead of once per test.
 
     Args:
         pr_files: Files changed in the PR (relative to brave-core root).
-        test_source_files: Files containing the test class (relative to src/).
-        test_location: 'brave', 'chromium', or 'unknown'.
 
     Returns:
-        Tuple of (assessment, reason). Assessment is one of:
-        'likely_from_pr', 'likely_unrelated', 'unknown'.
+        Dict with keys: files (set of PR files), dirs (set of their
+        directories and parent directories), and overrides (list of
+        (pr_file, override_dir) for chromium_src/ files, in PR order).
     """
-    if not test_source_files:
-        return "unknown", "Could not locate test source files"
-    if not pr_files:
-        return "unknown", "Could not determine PR changed files"
-
-    # Build sets of directories from PR files for quick lookup.
     # PR files are relative to brave-core root, which maps to src/brave/.
     pr_dirs = set()
-    pr_file_set = set(pr_files)
+    overrides = []
     for f in pr_files:
         parts = f.rsplit("/", 1)
         if len(parts) > 1:
@@ -590,6 +1368,33 @@ def assess_pr_correlation(pr_files, test_source_files, test_location):
             parent = parts[0].rsplit("/", 1)
             if len(parent) > 1:
                 pr_dirs.add(parent[0])
+        if f.startswith("chromium_src/"):
+            override_path = f[len("chromium_src/"):]
+            if "/" in override_path:
+                overrides.append((f, override_path.rsplit("/", 1)[0]))
+
+    return {"files": set(pr_files), "dirs": pr_dirs, "overrides": overrides}
+
+
+def assess_pr_correlation(pr_index, test_source_files, test_location):
+    """Determine if a test failure is likely related to PR changes.
+
+    Args:
+        pr_index: PR changed files as indexed by index_pr_files().
+        test_source_files: Files containing the test class (relative to src/).
+        test_location: 'brave', 'chromium', or 'unknown'.
+
+    Returns:
+        Tuple of (assessment, reason). Assessment is one of:
+        'likely_from_pr', 'likely_unrelated', 'unknown'.
+    """
+    if not test_source_files:
+        return "unknown", "Could not locate test source files"
+    if not pr_index["files"]:
+        return "unknown", "Could not determine PR changed files"
+
+    pr_file_set = pr_index["files"]
+    pr_dirs = pr_index["dirs"]
 
     for test_file in test_source_files:
         if test_file.startswith("brave/"):
@@ -612,18 +1417,17 @@ def assess_pr_correlation(pr_files, test_source_files, test_location):
             # e.g., test in chrome/browser/ui/ -> PR might have
             # chromium_src/chrome/browser/ui/ overrides.
             test_dir = test_file.rsplit("/", 1)[0] if "/" in test_file else ""
-            for pr_file in pr_files:
-                if pr_file.startswith("chromium_src/") and test_dir:
-                    override_path = pr_file[len("chromium_src/"):]
-                    override_dir = override_path.rsplit("/", 1)[0] if "/" in override_path else ""
-                    if override_dir and (
-                        override_dir == test_dir
-                        or override_dir.startswith(test_dir + "/")
-                        or test_dir.startswith(override_dir + "/")
-                    ):
-                        return "likely_from_pr", (
-                            f"PR has chromium_src override in related path: {pr_file}"
-                        )
+            if not test_dir:
+                continue
+            for pr_file, override_dir in pr_index["overrides"]:
+                if (
+                    override_dir == test_dir
+                    or override_dir.startswith(test_dir + "/")
+                    or test_dir.startswith(override_dir + "/")
+                ):
+                    return "likely_from_pr", (
+                        f"PR has chromium_src override in related path: {pr_file}"
+                    )
 
     if test_location == "chromium":
         return "likely_unrelated", (
@@ -633,47 +1437,121 @@ def assess_pr_correlation(pr_files, test_source_files, test_location):
     return "likely_unrelated", "PR changes do not overlap with test source location"
 
 
-def search_existing_issues(test_name):
-    """Search for existing open issues matching a test name in brave/brave-browser.
+# Cache for search_existing_issues results (same test fails on many platforms)
+_issue_search_cache = {}
+_issue_search_lock = threading.Lock()
 
-    Returns:
-        Dict with number, title, url of the best match, or None.
-    """
+# GitHub search allows at most five AND/OR/NOT operators per query
+ISSUE_SEARCH_BATCH_SIZE = 5
+
+
+def _gh_search_issues(query):
+    """Search open brave-browser issues via the gh CLI. Returns None on error."""
     try:
         result = subprocess.run(
             [
                 "gh", "issue", "list",
-                "--repo", "brave/brave-browser",
-                "--search", test_name,
+                "--repo", GITHUB_ISSUES_REPO,
+                "--search", query,
                 "--state", "open",
                 "--json", "number,title,url",
-                "--limit", "5",
+                "--limit", "100",
             ],
             capture_output=True,
             text=True,
             timeout=30,
         )
         if result.returncode != 0:
-            print(
+            log(
                 f"  Warning: Could not search issues: {result.stderr.strip()}",
-                file=sys.stderr,
             )
             return None
+        return _json_loads(result.stdout)
+    except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
+        log(f"  Warning: Error searching issues: {e}")
+        return None
 
-        issues = json.loads(result.stdout)
-        test_class = test_name.split(".")[0] if "." in test_name else test_name
-        for issue in issues:
-            title = issue.get("title", "")
-            if test_name in title or test_class in title:
-                return {
-                    "number": issue["number"],
-                    "title": issue["title"],
-                    "url": issue["url"],
-                }
+
+def _rest_search_issues(query):
+    """Search open brave-browser issues via the REST API. Returns None on error."""
+    query = f"{query} repo:{GITHUB_ISSUES_REPO} is:issue state:open"
+    try:
+        data, _ = github_request(f"/search/issues?q={quote(query)}&per_page=100")
+    except (urllib.error.HTTPError, urllib.error.URLError) as e:
+        log(f"  Warning: Could not search issues: {e}")
         return None
-    except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
-        print(f"  Warning: Error searching issues: {e}", file=sys.stderr)
+    return [
+        {"number": item["number"], "title": item["title"], "url": item["html_url"]}
+        for item in data.get("items", [])
+    ]
+
+
+def _match_issue(test_name, issues, batch=()):
+    """Return the issue in a search result that best matches a test.
+
+    An issue whose title names the test wins; otherwise the first one whose
+    title names its class. When the results came from a batched search,
+    issues whose title names another test of the batch are left to that
+    test rather than matched by class.
+    """
+    test_class = test_name.split(".")[0] if "." in test_name else test_name
+    others = [name for name in batch if name != test_name]
+    match = None
+    for issue in issues:
+        title = issue.get("title", "")
+        if test_name in title:
+            match = issue
+            break
+        if (match is None and test_class in title
+                and not any(name in title for name in others)):
+            match = issue
+    if match is None:
         return None
+    return {
+        "number": match["number"],
+        "title": match["title"],
+        "url": match["url"],
+    }
+
+
+def search_existing_issues_batch(test_names):
+    """Search for existing open issues for several tests in brave/brave-browser.
+
+    Test names are OR-ed together so one search covers up to
+    ISSUE_SEARCH_BATCH_SIZE tests, and results are matched to each test by
+    title. The Search API is limited to 30 requests/minute, so this keeps
+    large failure lists from exhausting it. Results are cached per test.
+
+    Returns:
+        Dict of {test_name: issue dict with number, title, url, or None}.
+    """
+    with _issue_search_lock:
+        pending = sorted(
+            {name for name in test_names if name not in _issue_search_cache}
+        )
+        for i in range(0, len(pending), ISSUE_SEARCH_BATCH_SIZE):
+            batch = pending[i:i + ISSUE_SEARCH_BATCH_SIZE]
+            query = " OR ".join(f'"{name}"' for name in batch)
+            if GH_TOKEN:
+                issues = _rest_search_issues(query)
+            else:
+                issues = _gh_search_issues(query)
+            if issues is None:
+                # Leave uncached so a later call can retry
+                continue
+            for name in batch:
+                _issue_search_cache[name] = _match_issue(name, issues, batch)
+
+        return {name: _issue_search_cache.get(name) for name in test_names}
+
+
+def search_existing_issues(test_name):
+    """Search for existing open issues matching a test name in brave/brave-browser.
+
+    Returns:
+        Dict with number, title, url of the best match, or None.
+    """
+    return search_existing_issues_batch([test_name])[test_name]
 
 
 def build_issue_suggestion(test_name, stack_trace, platform, upstream_flake):
@@ -711,6 +1589,62 @@ def build_issue_suggestion(test_name, stack_trace, platform, upstream_flake):
     }
 
 
+def analyze_one_failure(failure, platform, pr_index):
+    """Analyze a single failing test extracted from the console output.
+
+    Returns:
+        Test failure analysis dict.
+    """
+    test_name = failure["test_name"]
+    stack_trace = failure["stack_trace"]
+
+    log(f"    Analyzing: {test_name}")
+
+    # Classify location and find source files for PR correlation
+    test_class = test_name.split(".")[0] if "." in test_name else test_name
+    location, source_files = locate_test(test_class)
+
+    # Check upstream flake (chromium tests only)
+    upstream = None
+    if location == "chromium":
+        log(f"    Checking upstream flakiness...")
+        upstream = check_upstream_flake(test_name)
+
+    # Assess PR correlation
+    correlation, correlation_reason = assess_pr_correlation(
+        pr_index, source_files, location
+    )
+
+    # Search for existing issues
+    existing_issue = search_existing_issues(test_name)
+
+    # Determine if we should suggest filing an issue:
+    # Only if the failure seems unrelated to the PR AND no issue exists
+    suggest_filing = (
+        correlation == "likely_unrelated"
+        and existing_issue is None
+    )
+
+    issue_suggestion = None
+    if suggest_filing:
+        issue_suggestion = build_issue_suggestion(
+            test_name, stack_trace, platform, upstream
+        )
+
+    return {
+        "test_name": test_name,
+        "stack_trace": stack_trace,
+        "test_location": location,
+        "test_source_files": source_files,
+        "upstream_flake": upstream,
+        "pr_correlation": correlation,
+        "pr_correlation_reason": correlation_reason,
+        "existing_issue": existing_issue,
+        "suggest_filing_issue": suggest_filing,
+        "issue_suggestion": issue_suggestion,
+    }
+
+
 def analyze_test_failures(check, job, branch, build, auth_header, pr_number):
     """Analyze test failures for a single failing Jenkins check.
 
@@ -723,80 +1657,80 @@ def analyze_test_failures(check, job, branch, build, auth_header, pr_number):
     """
     platform = extract_platform_from_job(job)
 
-    # Fetch console output
-    print(f"  Fetching console output for {check['name']}...", file=sys.stderr)
-    console_text = fetch_console_tail(job, branch, build, auth_header)
-    if not console_text:
-        print("  Warning: No console output available", file=sys.stderr)
-        return []
-
-    # Extract test failures
-    raw_failures = extract_test_failures(console_text)
-    if not raw_failures:
-        print("  No GTest failures found in console output", file=sys.stderr)
-        return []
+    # Get PR changed files (cached across checks) from GitHub while the
+    # console log downloads from Jenkins
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pr_files = executor.submit(get_pr_changed_files, pr_number)
 
-    print(f"  Found {len(raw_failures)} failing test(s)", file=sys.stderr)
+        # Fetch console output
+        log(f"  Fetching console output for {check['name']}...")
+        console_lines = fetch_console_tail(job, branch, build, auth_header)
+        if not console_lines:
+            log("  Warning: No console output available")
+            return []
 
-    # Get PR changed files (cached across checks)
-    pr_files = get_pr_changed_files(pr_number)
+        # Extract test failures
+        raw_failures = extract_test_failures(console_lines)
+        if not raw_failures:
+            log("  No GTest failures found in console output")
+            return []
 
-    # Analyze each failure
-    test_failures = []
-    for failure in raw_failures:
-        test_name = failure["test_name"]
-        stack_trace = failure["stack_trace"]
+        log(f"  Found {len(raw_failures)} failing test(s)")
+        pr_index = index_pr_files(pr_files.result())
 
-        print(f"    Analyzing: {test_name}", file=sys.stderr)
+    # Locate every failing test class with a single scan of the test sources
+    locate_tests({f["test_name"].split(".")[0] for f in raw_failures})
 
-        # Classify location
-        test_class = test_name.split(".")[0] if "." in test_name else test_name
-        location = find_test_location(test_class)
+    # Search for existing issues of all failing tests in as few queries as
+    # the search syntax allows
+    search_existing_issues_batch([f["test_name"] for f in raw_failures])
 
-        # Find source files for PR correlation
-        source_files = get_test_source_files(test_class)
+    # Analyze each failure. Test locations and existing issues are already
+    # cached above; what runs concurrently here are the upstream flake
+    # checks, which check_upstream_flake() caps at FLAKE_MAX_CONCURRENCY.
+    with ThreadPoolExecutor(max_workers=min(8, len(raw_failures))) as executor:
+        return list(executor.map(
+            lambda failure: analyze_one_failure(failure, platform, pr_index),
+            raw_failures,
+        ))
 
-        # Check upstream flake (chromium tests only)
-        upstream = None
-        if location == "chromium":
-            print(f"    Checking upstream flakiness...", file=sys.stderr)
-            upstream = check_upstream_flake(test_name)
 
-        # Assess PR correlation
-        correlation, correlation_reason = assess_pr_correlation(
-            pr_files, source_files, location
-        )
+def process_check(check, auth_header, pr_number):
+    """Determine the failed stage and analyze test failures for one check.
 
-        # Search for existing issues
-        existing_issue = search_existing_issues(test_name)
+    Only reads from Jenkins/GitHub, so checks can be processed concurrently.
 
-        # Determine if we should suggest filing an issue:
-        # Only if the failure seems unrelated to the PR AND no issue exists
-        suggest_filing = (
-            correlation == "likely_unrelated"
-            and existing_issue is None
+    Returns:
+        The check dict, annotated in place with failed_stage, wipe, reason,
+        platform, and test_failures.
+    """
+    job, branch, build = parse_jenkins_url(check["link"])
+    if not job or not branch:
+        check["failed_stage"] = None
+        check["wipe"] = False
+        check["reason"] = f"Could not parse Jenkins URL: {check['link']}"
+        check["triggered"] = False
+        return check
+
+    log(f"Checking stage info for {check['name']}...")
+    failed_stage = get_failed_stage(job, branch, build, auth_header)
+    wipe, reason = decide_action(failed_stage)
+
+    check["failed_stage"] = failed_stage
+    check["wipe"] = wipe
+    check["reason"] = reason
+    check["platform"] = extract_platform_from_job(job)
+
+    # Analyze test failures when the failed stage is a test stage
+    if is_test_stage(failed_stage):
+        log(f"Test stage detected, analyzing failures...")
+        check["test_failures"] = analyze_test_failures(
+            check, job, branch, build, auth_header, pr_number
         )
+    else:
+        check["test_failures"] = []
 
-        issue_suggestion = None
-        if suggest_filing:
-            issue_suggestion = build_issue_suggestion(
-                test_name, stack_trace, platform, upstream
-            )
-
-        test_failures.append({
-            "test_name": test_name,
-            "stack_trace": stack_trace,
-            "test_location": location,
-            "test_source_files": source_files,
-            "upstream_flake": upstream,
-            "pr_correlation": correlation,
-            "pr_correlation_reason": correlation_reason,
-            "existing_issue": existing_issue,
-            "suggest_filing_issue": suggest_filing,
-            "issue_suggestion": issue_suggestion,
-        })
-
-    return test_failures
+    return check
 
 
 def trigger_build(job, branch, wipe, auth_header, crumb):
@@ -815,126 +1749,161 @@ def trigger_build(job, branch, wipe, auth_header, crumb):
             f"{JENKINS_BASE_URL}/job/{job}/job/{branch}/buildWithParameters"
         )
 
-    headers = {
-        "Authorization": auth_header,
-        "Content-Type": "application/x-www-form-urlencoded",
-    }
-    if crumb:
-        headers.update(crumb)
+    for attempt in range(2):
+        headers = {
+            "Authorization": auth_header,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        if crumb:
+            headers.update(crumb)
+
+        try:
+            with jenkins_open(url, headers, method="POST", data=b"") as resp:
+                # Jenkins returns 201 (Created) or 302 (redirect) on success
+                resp.read()
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 403 and attempt == 0:
+                # The cached crumb may no longer be valid; retry with a fresh one
+                crumb = get_crumb(auth_header, refresh=True)
+                continue
+            log(
+                f"  Error: Jenkins returned HTTP {e.code} when triggering "
+                f"{job}/{branch}: {e.reason}",
+            )
+            return False
+        except urllib.error.URLError as e:
+            log(
+                f"  Error: Could not reach Jenkins to trigger build: {e.reason}",
+            )
+            return False
+        except TimeoutError:
+            # Not retried: Jenkins may have queued the build already
+            log(
+                f"  Error: Jenkins timed out triggering {job}/{branch}; "
+                f"check whether the build was queued before retrying",
+            )
+            return False
 
-    req = urllib.request.Request(url, data=b"", headers=headers, method="POST")
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            # Jenkins returns 201 (Created) or 302 (redirect) on success
-            return True
-    except urllib.error.HTTPError as e:
-        # 201 may come as an "error" in some urllib versions
-        if e.code in (201, 302):
-            return True
-        print(
-            f"  Error: Jenkins returned HTTP {e.code} when triggering "
-            f"{job}/{branch}: {e.reason}",
-            file=sys.stderr,
-        )
-        return False
-    except urllib.error.URLError as e:
-        print(
-            f"  Error: Could not reach Jenkins to trigger build: {e.reason}",
-            file=sys.stderr,
-        )
-        return False
+def _last_lines(text, n):
+    """Return the last n lines of text, like text.split("\n")[-n:].
+
+    Walks back over the final n newlines instead of splitting the whole
+    text, so a long trace costs no more than the part that is kept.
+    """
+    end = len(text)
+    for _ in range(n):
+        end = text.rfind("\n", 0, end)
+        if end < 0:
+            return text.split("\n")
+    return text[end + 1:].split("\n")
+
+
+def partition_results(results):
+    """Split check results into the groups the formatters report on.
+
+    Returns:
+        Tuple of (failing Jenkins checks, failing non-Jenkins checks,
+        pending Jenkins checks), each in the original order.
+    """
+    failing, non_jenkins_failing, pending = [], [], []
+    for r in results:
+        state = r["state"]
+        if state == "FAILURE":
+            (failing if r["is_jenkins"] else non_jenkins_failing).append(r)
+        elif state == "PENDING" and r["is_jenkins"]:
+            pending.append(r)
+    return failing, non_jenkins_failing, pending
 
 
 def format_markdown(results, pr_number, dry_run):
     """Format results as human-readable markdown."""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
 
-    failing = [r for r in results if r["state"] == "FAILURE" and r["is_jenkins"]]
-    non_jenkins_failing = [r for r in results if r["state"] == "FAILURE" and not r["is_jenkins"]]
-    pending = [r for r in results if r["state"] == "PENDING" and r["is_jenkins"]]
+    failing, non_jenkins_failing, pending = partition_results(results)
 
     if not failing:
-        lines.append(f"No failing Jenkins CI checks found for PR {pr_number}.")
+        w(f"No failing Jenkins CI checks found for PR {pr_number}.\n")
         if non_jenkins_failing:
-            lines.append("")
-            lines.append("Non-Jenkins failures (not handled by this tool):")
+            w("\n")
+            w("Non-Jenkins failures (not handled by this tool):\n")
             for r in non_jenkins_failing:
-                lines.append(f"  - {r['name']}")
-        return "\n".join(lines)
+                w(f"  - {r['name']}\n")
+        return buf.getvalue()[:-1]
 
     action_word = "Would retrigger" if dry_run else "Retriggered"
-    lines.append(f"PR {pr_number}: {len(failing)} failing Jenkins check(s)\n")
+    w(f"PR {pr_number}: {len(failing)} failing Jenkins check(s)\n\n")
 
     for r in failing:
         status_icon = "OK" if r.get("triggered") else ("DRY-RUN" if dry_run else "FAILED")
         action = "WIPE_WORKSPACE" if r.get("wipe") else "normal"
-        lines.append(f"  [{status_icon}] {r['name']}")
-        lines.append(f"       Stage: {r.get('failed_stage', 'unknown')}")
-        lines.append(f"       Action: {action}")
-        lines.append(f"       Reason: {r.get('reason', '')}")
-        lines.append(f"       URL: {r.get('link', '')}")
+        w(f"  [{status_icon}] {r['name']}\n")
+        w(f"       Stage: {r.get('failed_stage', 'unknown')}\n")
+        w(f"       Action: {action}\n")
+        w(f"       Reason: {r.get('reason', '')}\n")
+        w(f"       URL: {r.get('link', '')}\n")
 
         # Test failure details
         test_failures = r.get("test_failures", [])
         if test_failures:
-            lines.append(f"       Test Failures ({len(test_failures)}):")
+            w(f"       Test Failures ({len(test_failures)}):\n")
             for tf in test_failures:
-                lines.append("")
-                lines.append(f"         - {tf['test_name']}")
-                lines.append(f"           Location: {tf['test_location']}")
+                w("\n")
+                w(f"         - {tf['test_name']}\n")
+                w(f"           Location: {tf['test_location']}\n")
 
                 if tf.get("upstream_flake"):
                     uf = tf["upstream_flake"]
-                    lines.append(f"           Upstream flake: {uf['verdict']}")
+                    w(f"           Upstream flake: {uf['verdict']}\n")
 
-                lines.append(
+                w(
                     f"           PR correlation: {tf['pr_correlation']}"
-                    f" ({tf['pr_correlation_reason']})"
+                    f" ({tf['pr_correlation_reason']})\n"
                 )
 
                 if tf.get("existing_issue"):
                     ei = tf["existing_issue"]
-                    lines.append(
-                        f"           Existing issue: #{ei['number']} - {ei['title']}"
+                    w(
+                        f"           Existing issue: #{ei['number']} - {ei['title']}\n"
                     )
-                    lines.append(f"             {ei['url']}")
+                    w(f"             {ei['url']}\n")
 
                 if tf.get("suggest_filing_issue") and tf.get("issue_suggestion"):
                     sug = tf["issue_suggestion"]
-                    lines.append(
-                        f"           >> SUGGEST FILING ISSUE: \"{sug['title']}\""
+                    w(
+                        f"           >> SUGGEST FILING ISSUE: \"{sug['title']}\"\n"
                     )
 
                 # Truncated stack trace
                 trace = tf.get("stack_trace", "")
                 if trace:
-                    trace_lines = trace.split("\n")[-20:]
-                    lines.append("           Stack trace (last 20 lines):")
-                    for tl in trace_lines:
-                        lines.append(f"             {tl}")
+                    w("           Stack trace (last 20 lines):\n")
+                    for tl in _last_lines(trace, 20):
+                        w(f"             {tl}\n")
 
-        lines.append("")
+        w("\n")
 
     if non_jenkins_failing:
-        lines.append("Non-Jenkins failures (skipped):")
+        w("Non-Jenkins failures (skipped):\n")
         for r in non_jenkins_failing:
-            lines.append(f"  - {r['name']}")
-        lines.append("")
+            w(f"  - {r['name']}\n")
+        w("\n")
 
     if pending:
-        lines.append("Still pending:")
+        w("Still pending:\n")
         for r in pending:
-            lines.append(f"  - {r['name']}")
+            w(f"  - {r['name']}\n")
 
-    return "\n".join(lines)
+    # Every write ends in a newline; drop the last one so the text matches
+    # the line-joined layout callers print.
+    return buf.getvalue()[:-1]
 
 
 def format_json(results, pr_number, dry_run):
     """Format results as JSON."""
-    failing = [r for r in results if r["state"] == "FAILURE" and r["is_jenkins"]]
-    non_jenkins_failing = [r for r in results if r["state"] == "FAILURE" and not r["is_jenkins"]]
-    pending = [r for r in results if r["state"] == "PENDING" and r["is_jenkins"]]
+    failing, non_jenkins_failing, pending = partition_results(results)
 
     output = {
         "pr_number": pr_number,
@@ -969,7 +1938,61 @@ def format_json(results, pr_number, dry_run):
         "non_jenkins_failures": [r["name"] for r in non_jenkins_failing],
         "pending": [r["name"] for r in pending],
     }
-    return json.dumps(output, indent=2)
+    return _json_dumps_indented(output)
+
+
+def analyze_checks(checks, auth_header, pr_number, max_workers):
+    """Run process_check() for every check concurrently."""
+    # Jenkins lookups for each check are independent, so run them in parallel
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(process_check, check, auth_header, pr_number)
+            for check in checks
+        ]
+        for future in as_completed(futures):
+            check = future.result()
+            log(f"Finished analyzing {check['name']}")
+
+
+def run_dry_run(checks, auth_header, pr_number):
+    """Analyze failing checks without fetching a crumb or triggering builds.
+
+    Nothing is POSTed, so checks are analyzed with more workers than a live
+    run uses. Jenkins requests stay capped by JENKINS_MAX_CONCURRENCY; the
+    extra workers overlap the GitHub and git work of each check.
+    """
+    analyze_checks(checks, auth_header, pr_number, DRY_RUN_WORKERS)
+    for check in checks:
+        check["triggered"] = False
+
+
+def run_live(checks, auth_header, pr_number):
+    """Analyze failing checks and retrigger each one on Jenkins."""
+    log("Fetching Jenkins CSRF crumb...")
+    crumb = get_crumb(auth_header)
+
+    analyze_checks(checks, auth_header, pr_number, LIVE_RUN_WORKERS)
+
+    triggers = []
+    for check in checks:
+        job, branch, _ = parse_jenkins_url(check["link"])
+        if job and branch:
+            triggers.append((check, job, branch))
+
+    def trigger(item):
+        check, job, branch = item
+        wipe = check["wipe"]
+        log(
+            f"Triggering {'WIPE_WORKSPACE ' if wipe else ''}rebuild for "
+            f"{check['name']}...",
+        )
+        check["triggered"] = trigger_build(job, branch, wipe, auth_header, crumb)
+
+    # Each trigger is an independent POST, so send them concurrently. All
+    # of them reuse the crumb fetched above.
+    if triggers:
+        with ThreadPoolExecutor(max_workers=min(6, len(triggers))) as executor:
+            list(executor.map(trigger, triggers))
 
 
 def main():
@@ -995,7 +2018,7 @@ def main():
     auth_header = make_auth_header(user, token)
 
     # Get all check statuses
-    print(f"Fetching checks for PR {args.pr_number}...", file=sys.stderr)
+    log(f"Fetching checks for PR {args.pr_number}...")
     checks = get_failing_checks(args.pr_number)
 
     # Find failing Jenkins checks
@@ -1014,48 +2037,10 @@ def main():
         print(output)
         sys.exit(3)
 
-    # Analyze each failing check
-    crumb = None
-    if not args.dry_run:
-        print("Fetching Jenkins CSRF crumb...", file=sys.stderr)
-        crumb = get_crumb(auth_header)
-
-    for check in failing_jenkins:
-        job, branch, build = parse_jenkins_url(check["link"])
-        if not job or not branch:
-            check["failed_stage"] = None
-            check["wipe"] = False
-            check["reason"] = f"Could not parse Jenkins URL: {check['link']}"
-            check["triggered"] = False
-            continue
-
-        print(f"Checking stage info for {check['name']}...", file=sys.stderr)
-        failed_stage = get_failed_stage(job, branch, build, auth_header)
-        wipe, reason = decide_action(failed_stage)
-
-        check["failed_stage"] = failed_stage
-        check["wipe"] = wipe
-        check["reason"] = reason
-        check["platform"] = extract_platform_from_job(job)
-
-        # Analyze test failures when the failed stage is a test stage
-        if is_test_stage(failed_stage):
-            print(f"Test stage detected, analyzing failures...", file=sys.stderr)
-            check["test_failures"] = analyze_test_failures(
-                check, job, branch, build, auth_header, args.pr_number
-            )
-        else:
-            check["test_failures"] = []
-
-        if args.dry_run:
-            check["triggered"] = False
-        else:
-            print(
-                f"Triggering {'WIPE_WORKSPACE ' if wipe else ''}rebuild for "
-                f"{check['name']}...",
-                file=sys.stderr,
-            )
-            check["triggered"] = trigger_build(job, branch, wipe, auth_header, crumb)
+    if args.dry_run:
+        run_dry_run(failing_jenkins, auth_header, args.pr_number)
+    else:
+        run_live(failing_jenkins, auth_header, args.pr_number)
 
     # Output results
     output = (
@@ -1067,4 +2052,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        save_github_etags()
@@ -7,27 +7,145 @@ statistics for a given test in the Chromium project.
 
 Usage:
     python3 scripts/check-upstream-flake.py "TestSuite.TestName" [--days 30] [--json]
+        [--no-cache | --refresh-cache]
 """
 
 import argparse
+import gzip
+import hashlib
+import heapq
+import http.client
+import io
 import json
+import os
 import sys
-import urllib.request
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import urllib.error
 from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+try:
+    # Optional: several times faster than the json module on large payloads
+    import orjson
+    _json_loads = orjson.loads
+
+    _json_dumps_bytes = orjson.dumps
+
+    def _json_dumps_indented(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _json_dumps_indented(obj):
+        return json.dumps(obj, indent=2)
 
 
 LUCI_ANALYSIS_HOST = "https://analysis.api.luci.app"
 PRPC_SERVICE = "luci.analysis.v1.TestHistory"
 CHROMIUM_PROJECT = "chromium"
 
-# pRPC responses are prefixed with )]}'\n (5 bytes) as XSSI protection
-PRPC_PREFIX = b")]}'\\n"  # Will handle both literal and actual newline
+# Number of matching test IDs whose flakiness is analyzed
+MAX_MATCHED_TESTS = 5
+
+_print_lock = threading.Lock()
+
+# Persistent connections to LUCI Analysis. http.client connections are not
+# thread-safe, so each thread keeps its own.
+_luci_local = threading.local()
+LUCI_RETRY_STATUSES = {502, 503, 504}
+LUCI_MAX_ATTEMPTS = 3
+
+# pRPC JSON responses are prefixed with )]}'\n (5 bytes) as XSSI protection.
+# Some Google services use the )]}',\n variant.
+PRPC_PREFIXES = (b")]}'\n", b")]}',\n")
+
+# On-disk cache of pRPC responses. Flakiness data has a daily grain, so an
+# hour-old answer is as good as a fresh one.
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "brave-core-tools",
+    "luci-flake",
+)
+CACHE_TTL = 3600
+
+# Set from --no-cache / --refresh-cache
+use_cache = True
+refresh_cache = False
+
+# Entries past CACHE_TTL are deleted on the first cache write of a run
+_cache_pruned = False
+_cache_prune_lock = threading.Lock()
+
+
+def _cache_path(method, body):
+    key = method + json.dumps(body, sort_keys=True)
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+
+def _cache_get(method, body):
+    """Return a cached response for the request, or None if absent or stale."""
+    try:
+        with open(_cache_path(method, body), "rb") as f:
+            entry = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("mtime", 0) > CACHE_TTL:
+        return None
+    return entry.get("payload")
+
+
+def _prune_cache():
+    """Delete cache files older than CACHE_TTL, once per process.
+
+    Stats and verdict queries are keyed by a time range rounded to the hour,
+    so their entries are never hit again once stale.
+    """
+    global _cache_pruned
+    with _cache_prune_lock:
+        if _cache_pruned:
+            return
+        _cache_pruned = True
+    cutoff = time.time() - CACHE_TTL
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def _cache_put(method, body, payload):
+    """Store a response for the request. Cache write failures are not fatal."""
+    _prune_cache()
+    path = _cache_path(method, body)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"mtime": time.time(), "payload": payload}, f)
+        # Atomic rename so concurrent runs never read a partial entry
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
 
 def prpc_request(method, body):
     """Make a pRPC request to the LUCI Analysis API.
 
+    Responses are cached on disk for CACHE_TTL seconds, keyed by method and
+    request body, unless caching was turned off on the command line. Each
+    page of a paginated query is cached separately.
+
     Args:
         method: RPC method name (e.g., "QueryTests")
         body: dict to send as JSON request body
@@ -38,89 +156,167 @@ def prpc_request(method, body):
     Raises:
         SystemExit on fatal errors (auth, network).
     """
-    url = f"{LUCI_ANALYSIS_HOST}/prpc/{PRPC_SERVICE}/{method}"
-    data = json.dumps(body).encode("utf-8")
-
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        },
-        method="POST",
-    )
+    if use_cache and not refresh_cache:
+        cached = _cache_get(method, body)
+        if cached is not None:
+            return cached
+
+    result = _prpc_fetch(method, body)
+    if use_cache:
+        _cache_put(method, body, result)
+    return result
+
+
+def _luci_post(path, data, headers, timeout=30):
+    """POST to LUCI Analysis over this thread's persistent HTTPS connection.
+
+    Reusing the connection (keep-alive) saves a TLS handshake on every page
+    of a paginated query. pRPC queries are read-only, so transient
+    502/503/504 responses are retried with backoff.
+
+    Returns:
+        Raw response body bytes.
+
+    Raises:
+        urllib.error.HTTPError on 4xx/5xx responses, urllib.error.URLError
+        if LUCI Analysis could not be reached.
+    """
+    for attempt in range(LUCI_MAX_ATTEMPTS):
+        # A keep-alive connection may have been closed by the server since
+        # the last call; reconnect once before treating it as a network error.
+        for reconnect in range(2):
+            conn = getattr(_luci_local, "conn", None)
+            if conn is None:
+                conn = http.client.HTTPSConnection(
+                    urlparse(LUCI_ANALYSIS_HOST).netloc, timeout=timeout
+                )
+                _luci_local.conn = conn
+            try:
+                conn.request("POST", path, body=data, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+                if resp.headers.get("Content-Encoding") == "gzip":
+                    raw = gzip.decompress(raw)
+                break
+            except (http.client.HTTPException, OSError, EOFError) as e:
+                conn.close()
+                _luci_local.conn = None
+                if reconnect:
+                    raise urllib.error.URLError(e)
+
+        if resp.status in LUCI_RETRY_STATUSES and attempt + 1 < LUCI_MAX_ATTEMPTS:
+            time.sleep(0.3 * 2 ** attempt)
+            continue
+        break
+
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            f"{LUCI_ANALYSIS_HOST}{path}", resp.status, resp.reason,
+            resp.headers, io.BytesIO(raw),
+        )
+    return raw
+
+
+def _prpc_fetch(method, body):
+    """Send a pRPC request, bypassing the cache. See prpc_request()."""
+    data = _json_dumps_bytes(body)
 
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            raw = resp.read()
+        raw = _luci_post(
+            f"/prpc/{PRPC_SERVICE}/{method}",
+            data,
+            {
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                # Verdict pages are repetitive JSON and compress ~10x
+                "Accept-Encoding": "gzip",
+            },
+        )
     except urllib.error.HTTPError as e:
+        # sys.exit(message) prints the message and exits 1 from the CLI, but
+        # leaves it to callers of check_test() whether to show it
         if e.code == 403:
-            print(
+            sys.exit(
                 "Error: 403 Forbidden from LUCI Analysis API. "
-                "The API may require authentication for this query.",
-                file=sys.stderr,
+                "The API may require authentication for this query."
             )
-            sys.exit(1)
         elif e.code == 404:
-            print(
-                f"Error: 404 Not Found for method {method}.",
-                file=sys.stderr,
-            )
-            sys.exit(1)
+            sys.exit(f"Error: 404 Not Found for method {method}.")
         else:
-            print(
-                f"Error: HTTP {e.code} from LUCI Analysis API: {e.reason}",
-                file=sys.stderr,
-            )
-            sys.exit(1)
+            sys.exit(f"Error: HTTP {e.code} from LUCI Analysis API: {e.reason}")
     except urllib.error.URLError as e:
-        print(f"Error: Could not connect to LUCI Analysis API: {e.reason}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(f"Error: Could not connect to LUCI Analysis API: {e.reason}")
 
-    # Strip the pRPC XSSI prefix. The prefix is )]}' followed by a newline.
-    # Find the first newline and skip everything up to and including it.
-    newline_idx = raw.find(b"\n")
-    if newline_idx >= 0:
-        raw = raw[newline_idx + 1 :]
+    # Strip the pRPC XSSI prefix by its known length instead of searching
+    # the body for the first newline.
+    for prefix in PRPC_PREFIXES:
+        if raw.startswith(prefix):
+            raw = raw[len(prefix):]
+            break
 
     try:
-        return json.loads(raw)
+        return _json_loads(raw)
     except json.JSONDecodeError:
-        print(f"Error: Could not parse API response as JSON.", file=sys.stderr)
-        print(f"Raw response (first 500 bytes): {raw[:500]}", file=sys.stderr)
-        sys.exit(1)
+        sys.exit(
+            "Error: Could not parse API response as JSON.\n"
+            f"Raw response (first 500 bytes): {raw[:500]}"
+        )
 
 
-def search_tests(test_name_substring):
+def search_tests(test_name_substring, max_exact_matches=None):
     """Search for test IDs matching a substring.
 
+    Args:
+        test_name_substring: Substring to match against test IDs.
+        max_exact_matches: If set, stop paging once this many IDs ending in
+            "/<test_name_substring>" were found. Those rank above every
+            other match, so later pages can't add a more relevant one.
+
     Returns:
         List of full test ID strings.
     """
     all_test_ids = []
-    page_token = None
+    exact_suffix = "/" + test_name_substring
+    exact_matches = 0
+    # Only the page token changes between pages
+    body = {
+        "project": CHROMIUM_PROJECT,
+        "testIdSubstring": test_name_substring,
+        "pageSize": 1000,
+    }
 
     while True:
-        body = {
-            "project": CHROMIUM_PROJECT,
-            "testIdSubstring": test_name_substring,
-            "pageSize": 100,
-        }
-        if page_token:
-            body["pageToken"] = page_token
-
         result = prpc_request("QueryTests", body)
         test_ids = result.get("testIds", [])
         all_test_ids.extend(test_ids)
 
+        if max_exact_matches:
+            exact_matches += sum(1 for tid in test_ids if tid.endswith(exact_suffix))
+            if exact_matches >= max_exact_matches:
+                break
+
         page_token = result.get("nextPageToken")
         if not page_token:
             break
+        body["pageToken"] = page_token
 
     return all_test_ids
 
 
+def partition_time_range(days):
+    """Build the partitionTimeRange predicate for the last `days` days.
+
+    The range ends at the start of the current hour. Whole hours keep the
+    request body, and so its cache key, stable across runs within the hour.
+    """
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    earliest = now - timedelta(days=days)
+    return {
+        "earliest": f"{earliest:%Y-%m-%dT%H:%M:%SZ}",
+        "latest": f"{now:%Y-%m-%dT%H:%M:%SZ}",
+    }
+
+
 def get_flakiness_stats(test_id, days):
     """Get flakiness statistics for a test over a time range.
 
@@ -131,27 +327,16 @@ def get_flakiness_stats(test_id, days):
     Returns:
         List of stat group dicts from the API.
     """
-    now = datetime.now(timezone.utc)
-    earliest = now - timedelta(days=days)
-
     all_groups = []
-    page_token = None
+    # Only the page token changes between pages
+    body = {
+        "project": CHROMIUM_PROJECT,
+        "testId": test_id,
+        "predicate": {"partitionTimeRange": partition_time_range(days)},
+        "pageSize": 1000,
+    }
 
     while True:
-        body = {
-            "project": CHROMIUM_PROJECT,
-            "testId": test_id,
-            "predicate": {
-                "partitionTimeRange": {
-                    "earliest": earliest.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "latest": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                }
-            },
-            "pageSize": 1000,
-        }
-        if page_token:
-            body["pageToken"] = page_token
-
         result = prpc_request("QueryStats", body)
         groups = result.get("groups", [])
         all_groups.extend(groups)
@@ -159,6 +344,7 @@ def get_flakiness_stats(test_id, days):
         page_token = result.get("nextPageToken")
         if not page_token:
             break
+        body["pageToken"] = page_token
 
     return all_groups
 
@@ -175,27 +361,16 @@ def get_test_verdicts(test_id, days):
     Returns:
         List of verdict dicts from the API.
     """
-    now = datetime.now(timezone.utc)
-    earliest = now - timedelta(days=days)
-
     all_verdicts = []
-    page_token = None
+    # Only the page token changes between pages
+    body = {
+        "project": CHROMIUM_PROJECT,
+        "testId": test_id,
+        "predicate": {"partitionTimeRange": partition_time_range(days)},
+        "pageSize": 1000,
+    }
 
     while True:
-        body = {
-            "project": CHROMIUM_PROJECT,
-            "testId": test_id,
-            "predicate": {
-                "partitionTimeRange": {
-                    "earliest": earliest.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "latest": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                }
-            },
-            "pageSize": 1000,
-        }
-        if page_token:
-            body["pageToken"] = page_token
-
         result = prpc_request("Query", body)
         verdicts = result.get("verdicts", [])
         all_verdicts.extend(verdicts)
@@ -203,10 +378,71 @@ def get_test_verdicts(test_id, days):
         page_token = result.get("nextPageToken")
         if not page_token:
             break
+        body["pageToken"] = page_token
 
     return all_verdicts
 
 
+# Column positions of the per-day counters in analyze_stats()
+(
+    _DAY_PASSED,
+    _DAY_FAILED,
+    _DAY_FLAKY,
+    _DAY_SKIPPED,
+    _DAY_EXECUTION_ERRORED,
+    _DAY_PRECLUDED,
+    _DAY_TOTAL,
+) = range(7)
+_DAY_COLUMNS = 7
+
+
+# Verdict order for overall_verdict(), most to least actionable
+_VERDICT_PRIORITY = {
+    "known_upstream_flake": 0,
+    "occasional_upstream_failures": 1,
+    "insufficient_data": 2,
+    "stable_upstream": 3,
+}
+
+_VERDICT_DISPLAY = {
+    "known_upstream_flake": "KNOWN UPSTREAM FLAKE",
+    "occasional_upstream_failures": "OCCASIONAL UPSTREAM FAILURES",
+    "stable_upstream": "STABLE UPSTREAM",
+    "insufficient_data": "INSUFFICIENT DATA",
+}
+
+
+def classify(meaningful_verdicts, flake_rate):
+    """Map verdict counts to a flakiness verdict.
+
+    Args:
+        meaningful_verdicts: Number of passed, failed and flaky verdicts.
+        flake_rate: Share of failed and flaky verdicts among those.
+
+    Returns:
+        Tuple of (verdict, recommendation).
+    """
+    if meaningful_verdicts < 10:
+        return (
+            "insufficient_data",
+            "Cannot determine -- insufficient upstream data for this test in the lookback period.",
+        )
+    if flake_rate >= 0.05:
+        return (
+            "known_upstream_flake",
+            "Safe to filter -- this test has a confirmed flakiness pattern in Chromium upstream.",
+        )
+    if flake_rate >= 0.01:
+        return (
+            "occasional_upstream_failures",
+            "Consider filtering -- test shows some upstream instability. Document findings in filter comment.",
+        )
+    return (
+        "stable_upstream",
+        "Investigate Brave-specific causes -- test appears stable in Chromium upstream.",
+    )
+
+
 def analyze_stats(stats_groups):
     """Analyze raw stats groups into an aggregate summary.
 
@@ -219,53 +455,57 @@ def analyze_stats(stats_groups):
     Returns:
         Dict with aggregated statistics and verdict.
     """
-    total_passed = 0
-    total_failed = 0
-    total_flaky = 0
-    total_skipped = 0
-    total_execution_errored = 0
-    total_precluded = 0
-
-    # Aggregate by date (across all variant hashes)
-    daily_agg = {}
+    # Aggregate by date (across all variant hashes) into fixed-position
+    # counters, indexed by the _DAY_* columns. The per-day dicts are only
+    # built once, after the loop, and the grand totals are column sums over
+    # the days rather than running sums over every group.
+    daily_agg = defaultdict(lambda: [0] * _DAY_COLUMNS)
+    _int = int
 
     for group in stats_groups:
         # Date is in partitionTime as ISO timestamp (e.g., "2026-02-07T00:00:00Z")
         partition_time = group.get("partitionTime", "")
         date_str = partition_time[:10] if partition_time else "unknown"
 
-        vc = group.get("verdictCounts", {})
-        passed = int(vc.get("passed", 0))
-        failed = int(vc.get("failed", 0))
-        flaky = int(vc.get("flaky", 0))
-        skipped = int(vc.get("skipped", 0))
-        execution_errored = int(vc.get("executionErrored", 0))
-        precluded = int(vc.get("precluded", 0))
-
-        total_passed += passed
-        total_failed += failed
-        total_flaky += flaky
-        total_skipped += skipped
-        total_execution_errored += execution_errored
-        total_precluded += precluded
-
-        if date_str not in daily_agg:
-            daily_agg[date_str] = {
-                "date": date_str,
-                "passed": 0, "failed": 0, "flaky": 0,
-                "skipped": 0, "execution_errored": 0, "precluded": 0,
-                "total": 0,
-            }
-        day = daily_agg[date_str]
-        day["passed"] += passed
-        day["failed"] += failed
-        day["flaky"] += flaky
-        day["skipped"] += skipped
-        day["execution_errored"] += execution_errored
-        day["precluded"] += precluded
-        day["total"] += passed + failed + flaky + skipped + execution_errored + precluded
+        vc_get = group.get("verdictCounts", {}).get
+        passed = _int(vc_get("passed", 0))
+        failed = _int(vc_get("failed", 0))
+        flaky = _int(vc_get("flaky", 0))
+        skipped = _int(vc_get("skipped", 0))
+        execution_errored = _int(vc_get("executionErrored", 0))
+        precluded = _int(vc_get("precluded", 0))
 
-    daily_data = [v for v in daily_agg.values() if v["total"] > 0]
+        day = daily_agg[date_str]
+        day[_DAY_PASSED] += passed
+        day[_DAY_FAILED] += failed
+        day[_DAY_FLAKY] += flaky
+        day[_DAY_SKIPPED] += skipped
+        day[_DAY_EXECUTION_ERRORED] += execution_errored
+        day[_DAY_PRECLUDED] += precluded
+        day[_DAY_TOTAL] += passed + failed + flaky + skipped + execution_errored + precluded
+
+    totals = [sum(column) for column in zip(*daily_agg.values())] or [0] * _DAY_COLUMNS
+    total_passed = totals[_DAY_PASSED]
+    total_failed = totals[_DAY_FAILED]
+    total_flaky = totals[_DAY_FLAKY]
+    total_skipped = totals[_DAY_SKIPPED]
+    total_execution_errored = totals[_DAY_EXECUTION_ERRORED]
+    total_precluded = totals[_DAY_PRECLUDED]
+
+    daily_data = [
+        {
+            "date": date_str,
+            "passed": day[_DAY_PASSED],
+            "failed": day[_DAY_FAILED],
+            "flaky": day[_DAY_FLAKY],
+            "skipped": day[_DAY_SKIPPED],
+            "execution_errored": day[_DAY_EXECUTION_ERRORED],
+            "precluded": day[_DAY_PRECLUDED],
+            "total": day[_DAY_TOTAL],
+        }
+        for date_str, day in daily_agg.items()
+        if day[_DAY_TOTAL] > 0
+    ]
 
     total_verdicts = total_passed + total_failed + total_flaky + total_skipped + total_execution_errored + total_precluded
     # Flake rate: count of (flaky + failed) vs total meaningful verdicts (excluding skipped/precluded)
@@ -275,19 +515,7 @@ def analyze_stats(stats_groups):
     else:
         flake_rate = 0.0
 
-    # Determine verdict
-    if meaningful_verdicts < 10:
-        verdict = "insufficient_data"
-        recommendation = "Cannot determine -- insufficient upstream data for this test in the lookback period."
-    elif flake_rate >= 0.05:
-        verdict = "known_upstream_flake"
-        recommendation = "Safe to filter -- this test has a confirmed flakiness pattern in Chromium upstream."
-    elif flake_rate >= 0.01:
-        verdict = "occasional_upstream_failures"
-        recommendation = "Consider filtering -- test shows some upstream instability. Document findings in filter comment."
-    else:
-        verdict = "stable_upstream"
-        recommendation = "Investigate Brave-specific causes -- test appears stable in Chromium upstream."
+    verdict, recommendation = classify(meaningful_verdicts, flake_rate)
 
     # Sort daily data by date
     daily_data.sort(key=lambda d: d["date"])
@@ -317,24 +545,13 @@ def analyze_verdicts(verdicts):
     Returns:
         Dict with aggregated statistics and verdict.
     """
-    total_passed = 0
-    total_failed = 0
-    total_flaky = 0
-    total_skipped = 0
-    total_other = 0
-
-    for v in verdicts:
-        status = v.get("status", "").upper()
-        if status == "PASSED":
-            total_passed += 1
-        elif status == "FAILED":
-            total_failed += 1
-        elif status == "FLAKY":
-            total_flaky += 1
-        elif status == "SKIPPED":
-            total_skipped += 1
-        else:
-            total_other += 1
+    # Counter tallies in C instead of a Python if/elif chain per verdict
+    statuses = Counter(v.get("status", "").upper() for v in verdicts)
+    total_passed = statuses["PASSED"]
+    total_failed = statuses["FAILED"]
+    total_flaky = statuses["FLAKY"]
+    total_skipped = statuses["SKIPPED"]
+    total_other = len(verdicts) - total_passed - total_failed - total_flaky - total_skipped
 
     total_verdicts = total_passed + total_failed + total_flaky + total_skipped + total_other
     meaningful_verdicts = total_passed + total_failed + total_flaky
@@ -343,18 +560,7 @@ def analyze_verdicts(verdicts):
     else:
         flake_rate = 0.0
 
-    if meaningful_verdicts < 10:
-        verdict = "insufficient_data"
-        recommendation = "Cannot determine -- insufficient upstream data for this test in the lookback period."
-    elif flake_rate >= 0.05:
-        verdict = "known_upstream_flake"
-        recommendation = "Safe to filter -- this test has a confirmed flakiness pattern in Chromium upstream."
-    elif flake_rate >= 0.01:
-        verdict = "occasional_upstream_failures"
-        recommendation = "Consider filtering -- test shows some upstream instability. Document findings in filter comment."
-    else:
-        verdict = "stable_upstream"
-        recommendation = "Investigate Brave-specific causes -- test appears stable in Chromium upstream."
+    verdict, recommendation = classify(meaningful_verdicts, flake_rate)
 
     return {
         "total_verdicts": total_verdicts,
@@ -372,6 +578,25 @@ def analyze_verdicts(verdicts):
     }
 
 
+def overall_verdict(test_results):
+    """Pick the worst verdict across all matched tests.
+
+    Args:
+        test_results: List of (test_id, analysis_dict) tuples.
+
+    Returns:
+        Tuple of (verdict, recommendation).
+    """
+    if not test_results:
+        return (
+            "not_found",
+            "Cannot determine -- test not found in Chromium LUCI Analysis database.",
+        )
+
+    worst = min(test_results, key=lambda t: _VERDICT_PRIORITY.get(t[1]["verdict"], 99))
+    return worst[1]["verdict"], worst[1]["recommendation"]
+
+
 def format_report_markdown(test_name, test_results, days):
     """Format the analysis results as human-readable markdown.
 
@@ -383,53 +608,48 @@ def format_report_markdown(test_name, test_results, days):
     Returns:
         Formatted markdown string.
     """
-    lines = []
-    lines.append(f"# Upstream Flake Check: {test_name}")
-    lines.append("")
-    lines.append(f"Lookback period: {days} days")
-    lines.append(f"Source: Chromium LUCI Analysis (analysis.api.luci.app)")
-    lines.append("")
+    buf = io.StringIO()
+    w = buf.write
+    w(f"# Upstream Flake Check: {test_name}\n")
+    w("\n")
+    w(f"Lookback period: {days} days\n")
+    w(f"Source: Chromium LUCI Analysis (analysis.api.luci.app)\n")
+    w("\n")
 
     if not test_results:
-        lines.append("## Result: Not Found")
-        lines.append("")
-        lines.append("No matching test IDs found in the Chromium LUCI Analysis database.")
-        lines.append("This test may be Brave-specific or use a different ID format.")
-        return "\n".join(lines)
+        w("## Result: Not Found\n")
+        w("\n")
+        w("No matching test IDs found in the Chromium LUCI Analysis database.\n")
+        w("This test may be Brave-specific or use a different ID format.\n")
+        return buf.getvalue()[:-1]
 
     for test_id, analysis in test_results:
-        lines.append(f"## Test: `{test_id}`")
-        lines.append("")
-
-        verdict_display = {
-            "known_upstream_flake": "KNOWN UPSTREAM FLAKE",
-            "occasional_upstream_failures": "OCCASIONAL UPSTREAM FAILURES",
-            "stable_upstream": "STABLE UPSTREAM",
-            "insufficient_data": "INSUFFICIENT DATA",
-        }
-        lines.append(f"### Verdict: {verdict_display.get(analysis['verdict'], analysis['verdict'])}")
-        lines.append("")
-        lines.append(f"**Recommendation:** {analysis['recommendation']}")
-        lines.append("")
-
-        lines.append("### Statistics")
-        lines.append("")
-        lines.append(f"- Meaningful verdicts (pass+fail+flaky): {analysis['meaningful_verdicts']}")
-        lines.append(f"- Passed: {analysis['passed']}")
-        lines.append(f"- Failed: {analysis['failed']}")
-        lines.append(f"- Flaky: {analysis['flaky']}")
+        w(f"## Test: `{test_id}`\n")
+        w("\n")
+
+        w(f"### Verdict: {_VERDICT_DISPLAY.get(analysis['verdict'], analysis['verdict'])}\n")
+        w("\n")
+        w(f"**Recommendation:** {analysis['recommendation']}\n")
+        w("\n")
+
+        w("### Statistics\n")
+        w("\n")
+        w(f"- Meaningful verdicts (pass+fail+flaky): {analysis['meaningful_verdicts']}\n")
+        w(f"- Passed: {analysis['passed']}\n")
+        w(f"- Failed: {analysis['failed']}\n")
+        w(f"- Flaky: {analysis['flaky']}\n")
         if analysis.get('skipped', 0) > 0:
-            lines.append(f"- Skipped: {analysis['skipped']}")
+            w(f"- Skipped: {analysis['skipped']}\n")
         if analysis.get('execution_errored', 0) > 0:
-            lines.append(f"- Execution errors: {analysis['execution_errored']}")
-        lines.append(f"- Flake rate: {analysis['flake_rate']:.1%}")
-        lines.append("")
+            w(f"- Execution errors: {analysis['execution_errored']}\n")
+        w(f"- Flake rate: {analysis['flake_rate']:.1%}\n")
+        w("\n")
 
         if analysis["daily_breakdown"]:
-            lines.append("### Daily Breakdown")
-            lines.append("")
-            lines.append("| Date | Total | Pass | Fail | Flaky | Rate |")
-            lines.append("|------|-------|------|------|-------|------|")
+            w("### Daily Breakdown\n")
+            w("\n")
+            w("| Date | Total | Pass | Fail | Flaky | Rate |\n")
+            w("|------|-------|------|------|-------|------|\n")
             for day in analysis["daily_breakdown"]:
                 day_meaningful = day["passed"] + day["failed"] + day["flaky"]
                 if day_meaningful > 0:
@@ -437,13 +657,13 @@ def format_report_markdown(test_name, test_results, days):
                     rate_str = f"{day_rate:.0%}"
                 else:
                     rate_str = "N/A"
-                lines.append(
+                w(
                     f"| {day['date']} | {day['total']} | {day['passed']} "
-                    f"| {day['failed']} | {day['flaky']} | {rate_str} |"
+                    f"| {day['failed']} | {day['flaky']} | {rate_str} |\n"
                 )
-            lines.append("")
+            w("\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()[:-1]
 
 
 def format_report_json(test_name, test_results, days):
@@ -469,24 +689,108 @@ def format_report_json(test_name, test_results, days):
             **analysis,
         })
 
-    # Overall verdict: use the worst verdict across all matched tests
-    if test_results:
-        verdict_priority = {
-            "known_upstream_flake": 0,
-            "occasional_upstream_failures": 1,
-            "insufficient_data": 2,
-            "stable_upstream": 3,
-        }
-        worst = min(test_results, key=lambda t: verdict_priority.get(t[1]["verdict"], 99))
-        output["overall_verdict"] = worst[1]["verdict"]
-        output["overall_recommendation"] = worst[1]["recommendation"]
-    else:
-        output["overall_verdict"] = "not_found"
-        output["overall_recommendation"] = (
-            "Cannot determine -- test not found in Chromium LUCI Analysis database."
+    output["overall_verdict"], output["overall_recommendation"] = (
+        overall_verdict(test_results)
+    )
+
+    return _json_dumps_indented(output)
+
+
+def fetch_one(test_id, days, log):
+    """Fetch and analyze the flakiness data of one test ID.
+
+    Args:
+        test_id: Full LUCI test ID string.
+        days: Number of days to look back.
+        log: Function that prints a progress message.
+
+    Returns:
+        Tuple of (test_id, analysis_dict).
+    """
+    log(f"Fetching stats for: {test_id}")
+    stats = get_flakiness_stats(test_id, days)
+
+    if stats:
+        return test_id, analyze_stats(stats)
+
+    # Fallback: try Query endpoint for individual verdicts
+    log(f"  No stats data for {test_id}, trying verdict query...")
+    verdicts = get_test_verdicts(test_id, days)
+    if verdicts:
+        return test_id, analyze_verdicts(verdicts)
+
+    return test_id, {
+        "total_verdicts": 0,
+        "meaningful_verdicts": 0,
+        "passed": 0,
+        "failed": 0,
+        "flaky": 0,
+        "skipped": 0,
+        "execution_errored": 0,
+        "precluded": 0,
+        "flake_rate": 0.0,
+        "verdict": "insufficient_data",
+        "recommendation": "Cannot determine -- no data found for this test ID in the lookback period.",
+        "daily_breakdown": [],
+    }
+
+
+def check_test(test_name, days=30, verbose=True):
+    """Look up the upstream flakiness of tests matching a name.
+
+    Can be imported and called directly so that callers checking many tests
+    avoid starting an interpreter per test.
+
+    Args:
+        test_name: Test name or substring to search for.
+        days: Number of days to look back.
+        verbose: Print progress to stderr.
+
+    Returns:
+        List of (test_id, analysis_dict) tuples for up to five of the most
+        relevant matching test IDs. Empty if no test matched.
+
+    Raises:
+        SystemExit on fatal API errors (auth, network), carrying the error
+        message instead of printing it.
+    """
+    def log(message):
+        if verbose:
+            # Test IDs are fetched on worker threads
+            with _print_lock:
+                print(message, file=sys.stderr)
+
+    # Step 1: Search for matching test IDs
+    log(f"Searching for '{test_name}' in Chromium LUCI Analysis...")
+    test_ids = search_tests(test_name, max_exact_matches=MAX_MATCHED_TESTS)
+
+    if not test_ids:
+        log("No matching test IDs found.")
+        return []
+
+    log(f"Found {len(test_ids)} matching test ID(s).")
+
+    # Limit to top 5 most relevant matches
+    # Prefer exact matches (test name at the end of the ID)
+    exact_suffix = "/" + test_name
+
+    def relevance_sort_key(tid):
+        if not tid.endswith(test_name):
+            return (2, tid)
+        # Exact suffix match is most relevant
+        return (0 if tid.endswith(exact_suffix) else 1, tid)
+
+    test_ids = heapq.nsmallest(MAX_MATCHED_TESTS, test_ids, key=relevance_sort_key)
+
+    # Step 2: Get flakiness stats for each matched test. Each lookup is an
+    # independent multi-page conversation, so run them concurrently;
+    # map() keeps the results in relevance order.
+    with ThreadPoolExecutor(max_workers=len(test_ids)) as executor:
+        test_results = list(
+            executor.map(lambda test_id: fetch_one(test_id, days, log), test_ids)
         )
 
-    return json.dumps(output, indent=2)
+    return test_results
 
 
 def main():
@@ -510,8 +814,22 @@ def main():
         dest="json_output",
         help="Output in JSON format instead of markdown",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the local response cache",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore cached responses but store the fresh ones",
+    )
     args = parser.parse_args()
 
+    global use_cache, refresh_cache
+    use_cache = not args.no_cache
+    refresh_cache = args.refresh_cache
+
     if args.days < 1 or args.days > 90:
         print("Error: --days must be between 1 and 90.", file=sys.stderr)
         sys.exit(1)
@@ -519,65 +837,16 @@ def main():
     test_name = args.test_name
     days = args.days
 
-    # Step 1: Search for matching test IDs
-    print(f"Searching for '{test_name}' in Chromium LUCI Analysis...", file=sys.stderr)
-    test_ids = search_tests(test_name)
+    # Steps 1-2: Search for matching test IDs and get their flakiness stats
+    test_results = check_test(test_name, days)
 
-    if not test_ids:
-        print("No matching test IDs found.", file=sys.stderr)
+    if not test_results:
         if args.json_output:
             print(format_report_json(test_name, [], days))
         else:
             print(format_report_markdown(test_name, [], days))
         sys.exit(2)
 
-    print(f"Found {len(test_ids)} matching test ID(s).", file=sys.stderr)
-
-    # Limit to top 5 most relevant matches
-    # Prefer exact matches (test name at the end of the ID)
-    def relevance_sort_key(tid):
-        # Exact suffix match is most relevant
-        if tid.endswith("/" + test_name):
-            return (0, tid)
-        if tid.endswith(test_name):
-            return (1, tid)
-        return (2, tid)
-
-    test_ids.sort(key=relevance_sort_key)
-    test_ids = test_ids[:5]
-
-    # Step 2: Get flakiness stats for each matched test
-    test_results = []
-    for test_id in test_ids:
-        print(f"Fetching stats for: {test_id}", file=sys.stderr)
-        stats = get_flakiness_stats(test_id, days)
-
-        if stats:
-            analysis = analyze_stats(stats)
-        else:
-            # Fallback: try Query endpoint for individual verdicts
-            print(f"  No stats data, trying verdict query...", file=sys.stderr)
-            verdicts = get_test_verdicts(test_id, days)
-            if verdicts:
-                analysis = analyze_verdicts(verdicts)
-            else:
-                analysis = {
-                    "total_verdicts": 0,
-                    "meaningful_verdicts": 0,
-                    "passed": 0,
-                    "failed": 0,
-                    "flaky": 0,
-                    "skipped": 0,
-                    "execution_errored": 0,
-                    "precluded": 0,
-                    "flake_rate": 0.0,
-                    "verdict": "insufficient_data",
-                    "recommendation": "Cannot determine -- no data found for this test ID in the lookback period.",
-                    "daily_breakdown": [],
-                }
-
-        test_results.append((test_id, analysis))
-
     # Step 3: Output report
     if args.json_output:
         print(format_report_json(test_name, test_results, days))
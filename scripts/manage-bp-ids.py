@@ -7,13 +7,25 @@ docs/best-practices/*.md so review-bot links always resolve.
 Usage:
   manage-bp-ids.py --assign     Add IDs to headings that lack them
   manage-bp-ids.py --validate   Check all headings have unique IDs (read-only)
-  manage-bp-ids.py --check-link <id> [--doc <doc.md>]
-                                Check if an ID exists (exit 0 = found, 1 = not found)
+  manage-bp-ids.py --check-link <id>... [--doc <doc.md>]
+                                Check if IDs exist (exit 0 = all found, 1 = not found)
+  manage-bp-ids.py --check-link - [--doc <doc.md>] < ids.txt
+                                Same, with one ID per line read from stdin
+
+--check-link without --doc reads IDs from an index under
+~/.cache/brave-core-tools/bp-ids/, rebuilt whenever a doc changes.
 """
 
 import argparse
+import functools
+import hashlib
+import io
+import json
+import os
 import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 DOCS_DIR = Path(__file__).resolve().parent.parent / "docs" / "best-practices"
@@ -36,154 +48,310 @@ DOC_PREFIXES = {
     "android": "AND",
     "ios": "IOS",
     "nala": "NA",
-    "localization": "L10N",
     "patches": "PATCH",
     "plaster": "PLSTR",
     "ui-views": "UV",
 }
 
-ANCHOR_RE = re.compile(r'^<a\s+id="([^"]+)"\s*></a>\s*$')
-HEADING_RE = re.compile(r"^(#{2,3})\s+(.+)$")
+# Building blocks of HEADING_RE. [^\S\n] is whitespace other than a newline,
+# so each part only ever matches within its own line. Docs are read with
+# their line endings intact; the \r of a CRLF counts as such whitespace.
+ANCHOR_LINE = r'<a[^\S\n]+id="(?P<id>%s)"[^\S\n]*></a>[^\S\n]*\n'
+BLANK_LINES = r"(?:[^\S\n]*\n)*"
+HEADING_LINE = r"(?P<hashes>#{2,3})[^\S\n]+(?P<text>[^\r\n]+)\r?$"
+# A ## or ### heading, plus the ID of the anchor tag that is the preceding
+# non-blank line, if there is one. Matched against a whole doc at once.
+# Every repeated part is bounded by a literal or by the end of its line, so
+# a failed attempt backtracks at most within one line and a scan stays
+# linear in the doc size with the stdlib re engine.
+HEADING_RE = re.compile(
+    r"(?m)^(?:" + ANCHOR_LINE % r'[^"\n]+' + BLANK_LINES + ")?" + HEADING_LINE
+)
+# An ID assigned with one of the DOC_PREFIXES: prefix and sequence number,
+# e.g. "CSM-012". IDs with any other prefix never affect numbering.
+SEQ_RE = re.compile(
+    r"^(%s)-([0-9]+)$" % "|".join(map(re.escape, sorted(set(DOC_PREFIXES.values()))))
+)
+
+# On-disk index of every ID, so --check-link does not reparse the docs on
+# each call. One file per checkout; it is rebuilt whenever any doc changes.
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "brave-core-tools",
+    "bp-ids",
+)
+INDEX_FILE = os.path.join(
+    CACHE_DIR,
+    hashlib.sha256(str(DOCS_DIR).encode("utf-8")).hexdigest()[:16] + ".json",
+)
+
+# Text of each doc read so far: {path: (mtime_ns, size, text)}. --assign
+# parses every doc once to collect IDs and then again to rewrite it, so
+# this saves the second read.
+_text_cache = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _md_files():
+    """Return the docs in DOCS_DIR, sorted by name, listing the directory once.
+
+    Call _md_files.cache_clear() if docs are added or removed in-process.
+    """
+    # scandir reports each entry's type from the directory listing itself,
+    # without the pattern matching and per-entry Path objects of glob()
+    with os.scandir(DOCS_DIR) as it:
+        names = sorted(e.name for e in it if e.name.endswith(".md") and e.is_file())
+    return tuple(DOCS_DIR / name for name in names)
+
+
+def _read_text(path: Path):
+    """Return the text of path, reusing the last read if it is unchanged."""
+    st = path.stat()
+    cached = _text_cache.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    # newline="" keeps CRLF line endings, so --assign can write them back
+    with path.open(newline="") as f:
+        text = f.read()
+    _text_cache[path] = (st.st_mtime_ns, st.st_size, text)
+    return text
+
 
+def parse_doc(path: Path, line_numbers=True):
+    """Yield (line_index, heading_text, existing_id_or_None) for each heading.
 
-def parse_doc(path: Path):
-    """Yield (line_index, heading_text, existing_id_or_None) for each heading."""
-    lines = path.read_text().splitlines()
-    for i, line in enumerate(lines):
-        m = HEADING_RE.match(line)
-        if not m:
+    The whole doc is scanned by HEADING_RE in one pass. line_index is None
+    when line_numbers is false, for callers that only need the IDs.
+    """
+    text = _read_text(path)
+    # Running line count: only the newlines since the previous heading are
+    # counted, so numbering a doc is a single pass over its text
+    line_idx, pos = 0, 0
+    count = text.count
+    for m in HEADING_RE.finditer(text):
+        heading, eid = m.group("text", "id")
+        if not line_numbers:
+            yield None, heading, eid
             continue
-        heading_text = m.group(2)
-        existing_id = None
-        # Check if the preceding non-blank line is an anchor tag
-        j = i - 1
-        while j >= 0 and lines[j].strip() == "":
-            j -= 1
-        if j >= 0:
-            am = ANCHOR_RE.match(lines[j])
-            if am:
-                existing_id = am.group(1)
-        yield i, heading_text, existing_id
+        start = m.start("hashes")
+        line_idx += count("\n", pos, start)
+        pos = start
+        yield line_idx, heading, eid
+
+
+def parse_all_docs(line_numbers=True):
+    """Parse every doc, returning [(path, [parse_doc() tuples])] in name order.
+
+    Reading and scanning a doc mostly runs outside the GIL, so docs are
+    parsed on a thread pool.
+    """
+    files = _md_files()
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        parsed = executor.map(lambda md: list(parse_doc(md, line_numbers)), files)
+        return list(zip(files, parsed))
 
 
 def collect_all_ids():
     """Return {id: (file, heading_text)} for every ID across all docs."""
     all_ids = {}
-    for md in sorted(DOCS_DIR.glob("*.md")):
-        for _, heading, eid in parse_doc(md):
+    for md, headings in parse_all_docs(line_numbers=False):
+        for _, heading, eid in headings:
             if eid:
                 all_ids[eid] = (md.name, heading)
     return all_ids
 
 
+def _doc_stamps():
+    """Return {file name: [mtime_ns, size]} for every doc."""
+    stamps = {}
+    for md in _md_files():
+        st = md.stat()
+        stamps[md.name] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def _load_index(stamps):
+    """Return the indexed IDs if they were built from these docs, else None."""
+    try:
+        with open(INDEX_FILE) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("files") != stamps:
+        return None
+    return index.get("ids")
+
+
+def _save_index(stamps, all_ids):
+    """Store the ID index on disk. Write failures are not fatal."""
+    tmp_path = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"files": stamps, "ids": all_ids}, f)
+        # Atomic rename so concurrent runs never read a partial index
+        os.replace(tmp_path, INDEX_FILE)
+    except OSError:
+        pass
+
+
+def indexed_ids():
+    """Return collect_all_ids(), served from the on-disk index when current."""
+    # Stat before parsing: a doc edited mid-run then fails the next check
+    stamps = _doc_stamps()
+    all_ids = _load_index(stamps)
+    if all_ids is None:
+        all_ids = collect_all_ids()
+        _save_index(stamps, all_ids)
+    return all_ids
+
+
 def cmd_validate():
+    stamps = _doc_stamps()
     errors = []
-    all_ids = {}
-    for md in sorted(DOCS_DIR.glob("*.md")):
-        for line_idx, heading, eid in parse_doc(md):
-            if not eid:
-                errors.append(f"  MISSING ID: {md.name}:{line_idx + 1}  {heading}")
+    # Every place each ID is used: {id: [(file, heading_text), ...]}
+    occurrences = defaultdict(list)
+    for md, headings in parse_all_docs():
+        for line_idx, heading, eid in headings:
+            if eid:
+                occurrences[eid].append((md.name, heading))
             else:
-                if eid in all_ids:
-                    prev_file, prev_heading = all_ids[eid]
-                    errors.append(
-                        f"  DUPLICATE ID '{eid}': {md.name} ({heading}) "
-                        f"vs {prev_file} ({prev_heading})"
-                    )
-                all_ids[eid] = (md.name, heading)
+                errors.append(f"  MISSING ID: {md.name}:{line_idx + 1}  {heading}")
+
+    # Report each duplicated ID once, listing all of its headings
+    for eid, occs in occurrences.items():
+        if len(occs) > 1:
+            places = " vs ".join(f"{fname} ({heading})" for fname, heading in occs)
+            errors.append(f"  DUPLICATE ID '{eid}': {places}")
 
     if errors:
         print("Validation FAILED:")
         for e in errors:
             print(e)
         return 1
-    print(f"OK: {len(all_ids)} headings, all have unique IDs.")
+    _save_index(stamps, {eid: occs[0] for eid, occs in occurrences.items()})
+    print(f"OK: {len(occurrences)} headings, all have unique IDs.")
     return 0
 
 
 def cmd_assign():
-    existing_ids = collect_all_ids()
-    total_added = 0
+    # Parse every doc once. That pass finds the headings that need an ID and
+    # the highest sequence number already used for each prefix in any doc.
+    stamps = _doc_stamps()
+    docs = parse_all_docs()
+    max_seq = defaultdict(int)
+    seq_match = SEQ_RE.match
+    for _, headings in docs:
+        for _, _, eid in headings:
+            m = eid and seq_match(eid)
+            if m:
+                prefix, seq = m.group(1), int(m.group(2))
+                if seq > max_seq[prefix]:
+                    max_seq[prefix] = seq
 
-    for md in sorted(DOCS_DIR.glob("*.md")):
-        stem = md.stem
-        prefix = DOC_PREFIXES.get(stem)
+    total_added = 0
+    for md, headings in docs:
+        prefix = DOC_PREFIXES.get(md.stem)
         if prefix is None:
             print(f"WARNING: no prefix mapping for {md.name}, skipping")
             continue
+        # Nothing to rewrite in a doc whose headings all have IDs
+        if all(eid for _, _, eid in headings):
+            continue
 
-        # Find the highest existing sequence number for this prefix
-        max_seq = 0
-        for eid in existing_ids:
-            if eid.startswith(prefix + "-"):
-                try:
-                    seq = int(eid[len(prefix) + 1 :])
-                    max_seq = max(max_seq, seq)
-                except ValueError:
-                    pass
-
-        lines = md.read_text().splitlines()
-        new_lines = []
-        i = 0
+        # Splice an anchor in front of each heading that lacks one, copying
+        # the lines in between, line endings included, as they are. Lines
+        # are split on "\n" only, as parse_doc() numbers them:
+        # str.splitlines() would also break on \f, \x85, \u2028, etc.
+        lines = [line + "\n" for line in _read_text(md).split("\n")]
+        lines[-1] = lines[-1][:-1]
+        buf = io.StringIO()
+        write = buf.write
+        start = 0
         added = 0
-        while i < len(lines):
-            m = HEADING_RE.match(lines[i])
-            if m:
-                # Check if preceding line is already an anchor
-                has_anchor = False
-                j = len(new_lines) - 1
-                while j >= 0 and new_lines[j].strip() == "":
-                    j -= 1
-                if j >= 0:
-                    am = ANCHOR_RE.match(new_lines[j])
-                    if am:
-                        has_anchor = True
-
-                if not has_anchor:
-                    max_seq += 1
-                    new_id = f"{prefix}-{max_seq:03d}"
-                    # Ensure blank line before anchor for readability
-                    if new_lines and new_lines[-1].strip() != "":
-                        new_lines.append("")
-                    new_lines.append(f'<a id="{new_id}"></a>')
-                    new_lines.append("")
-                    existing_ids[new_id] = (md.name, m.group(2))
-                    added += 1
-
-            new_lines.append(lines[i])
-            i += 1
+        for i, _, eid in headings:
+            if eid:
+                continue
+            write("".join(lines[start:i]))
+            max_seq[prefix] += 1
+            new_id = f"{prefix}-{max_seq[prefix]:03d}"
+            # New lines follow the heading's line ending
+            eol = "\r\n" if lines[i].endswith("\r\n") else "\n"
+            # Ensure blank line before anchor for readability
+            prev = lines[i - 1] if i > 0 else ""
+            if prev and not prev.isspace():
+                write(eol)
+            write(f'<a id="{new_id}"></a>{eol}{eol}')
+            start = i
+            added += 1
 
         if added > 0:
-            md.write_text("\n".join(new_lines) + "\n")
-            print(f"  {md.name}: added {added} IDs ({prefix}-001..{prefix}-{max_seq:03d})")
+            write("".join(lines[start:]))
+            md.write_text(buf.getvalue(), newline="")
+            _text_cache.pop(md, None)
+            print(
+                f"  {md.name}: added {added} IDs "
+                f"({prefix}-001..{prefix}-{max_seq[prefix]:03d})"
+            )
             total_added += added
 
+    # Index the docs as rewritten; only the changed files are read again. If
+    # none changed, the IDs parsed above are already complete.
+    if total_added:
+        stamps = _doc_stamps()
+        all_ids = collect_all_ids()
+    else:
+        all_ids = {}
+        for md, headings in docs:
+            for _, heading, eid in headings:
+                if eid:
+                    all_ids[eid] = (md.name, heading)
+    _save_index(stamps, all_ids)
     print(f"\nTotal: {total_added} IDs added.")
     return 0
 
 
-def cmd_check_link(fragment: str, doc: str | None = None):
-    """Check if a fragment ID exists. Returns 0 if found, 1 if not."""
+def cmd_check_link(fragments: list[str], doc: str | None = None):
+    """Check that every fragment ID exists. Returns 0 if all are found, 1 if not.
+
+    A single fragment of "-" reads newline-separated IDs from stdin, so a
+    batch of links is resolved in one run.
+    """
+    if fragments == ["-"]:
+        fragments = [line.strip() for line in sys.stdin if line.strip()]
+
     if doc:
         target = DOCS_DIR / doc
         if not target.exists():
             print(f"NOT FOUND: doc '{doc}' does not exist")
             return 1
-        for _, _, eid in parse_doc(target):
-            if eid == fragment:
+        text = _read_text(target)
+        status = 0
+        for fragment in fragments:
+            # Search for this one anchor directly instead of parsing every heading
+            anchor_re = re.compile(
+                r"(?m)^" + ANCHOR_LINE % re.escape(fragment) + BLANK_LINES + HEADING_LINE
+            )
+            if anchor_re.search(text):
                 print(f"OK: {fragment} found in {doc}")
-                return 0
-        print(f"NOT FOUND: {fragment} not in {doc}")
-        return 1
+            else:
+                print(f"NOT FOUND: {fragment} not in {doc}")
+                status = 1
+        return status
 
     # Search all docs
-    all_ids = collect_all_ids()
-    if fragment in all_ids:
-        fname, heading = all_ids[fragment]
-        print(f"OK: {fragment} found in {fname} ({heading})")
-        return 0
-    print(f"NOT FOUND: {fragment}")
-    return 1
+    all_ids = indexed_ids()
+    status = 0
+    for fragment in fragments:
+        if fragment in all_ids:
+            fname, heading = all_ids[fragment]
+            print(f"OK: {fragment} found in {fname} ({heading})")
+        else:
+            print(f"NOT FOUND: {fragment}")
+            status = 1
+    return status
 
 
 def main():
@@ -191,7 +359,12 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--assign", action="store_true", help="Add IDs to headings missing them")
     group.add_argument("--validate", action="store_true", help="Check all IDs are unique")
-    group.add_argument("--check-link", metavar="ID", help="Check if an ID exists")
+    group.add_argument(
+        "--check-link",
+        metavar="ID",
+        nargs="+",
+        help="Check if IDs exist ('-' reads one ID per line from stdin)",
+    )
     parser.add_argument("--doc", help="Limit --check-link to a specific doc file")
     args = parser.parse_args()
 
@@ -22,52 +22,93 @@ Environment:
 
 import argparse
 import csv
+import functools
+import hashlib
+import http.client
 import io
+import itertools
 import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
+try:
+    # Optional: several times faster than the json module on large payloads
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps_compact(obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def _json_dumps_indented(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_compact(obj):
+        return json.dumps(obj, separators=(",", ":"))
+
+    def _json_dumps_indented(obj):
+        return json.dumps(obj, indent=2)
+
 BACKTRACE_ENDPOINT = "https://brave.sp.backtrace.io"
 BACKTRACE_UNIVERSE = "brave"
 
 MAX_RETRIES = 2
 RETRY_BACKOFF = [1, 3]  # seconds
+_RETRY_BACKOFF_MAX_IDX = len(RETRY_BACKOFF) - 1
 REQUEST_TIMEOUT = 20  # seconds
 MAX_FRAME_LENGTH = 200
 
-# Brave-specific namespace/prefix patterns for code origin classification
+# Brave-specific namespace/prefix patterns for code origin classification.
+# Each is matched at a word boundary, case-insensitively.
 BRAVE_CODE_PATTERNS = [
-    re.compile(r'\bbrave[:_]', re.IGNORECASE),
-    re.compile(r'\bntp_background_images::', re.IGNORECASE),
-    re.compile(r'\bbrave_ads::', re.IGNORECASE),
-    re.compile(r'\bbrave_new_tab_page', re.IGNORECASE),
-    re.compile(r'\bbrave_wallet::', re.IGNORECASE),
-    re.compile(r'\bbrave_rewards::', re.IGNORECASE),
-    re.compile(r'\bbrave_shields::', re.IGNORECASE),
-    re.compile(r'\bmisc_metrics::', re.IGNORECASE),
-    re.compile(r'\bBraveProfile', re.IGNORECASE),
-    re.compile(r'\bBraveBrowser', re.IGNORECASE),
-    re.compile(r'\bspeedreader::', re.IGNORECASE),
-    re.compile(r'\bipfs::', re.IGNORECASE),
-    re.compile(r'\btor::', re.IGNORECASE),
-    re.compile(r'\bai_chat::', re.IGNORECASE),
-    re.compile(r'\bskus::', re.IGNORECASE),
-    re.compile(r'\bplaylist::', re.IGNORECASE),
-    re.compile(r'\bdecentralized_dns::', re.IGNORECASE),
-    re.compile(r'\bbrave_vpn::', re.IGNORECASE),
-    re.compile(r'\bbrave_sync::', re.IGNORECASE),
-    re.compile(r'\bbrave_search', re.IGNORECASE),
-    re.compile(r'\bbrave_news::', re.IGNORECASE),
-    re.compile(r'\bbrave_federated::', re.IGNORECASE),
+    r'brave[:_]',
+    r'ntp_background_images::',
+    r'brave_ads::',
+    r'brave_new_tab_page',
+    r'brave_wallet::',
+    r'brave_rewards::',
+    r'brave_shields::',
+    r'misc_metrics::',
+    r'BraveProfile',
+    r'BraveBrowser',
+    r'speedreader::',
+    r'ipfs::',
+    r'tor::',
+    r'ai_chat::',
+    r'skus::',
+    r'playlist::',
+    r'decentralized_dns::',
+    r'brave_vpn::',
+    r'brave_sync::',
+    r'brave_search',
+    r'brave_news::',
+    r'brave_federated::',
 ]
+# Every alternative is a literal (plus one character class) with no
+# quantifiers, so the stdlib engine can't backtrack past a single
+# alternative and matching stays linear in the frame length. Frames are
+# capped at MAX_FRAME_LENGTH and only the top three are checked, which
+# leaves nothing for a DFA engine such as re2 or hyperscan to win.
+_BRAVE_CODE_RE = re.compile(
+    r'\b(?:' + '|'.join(BRAVE_CODE_PATTERNS) + ')', re.IGNORECASE)
+
+# grep results for crashing symbols, per brave checkout, kept across runs
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "brave-core-tools",
+    "top-crashers",
+)
 
 # Fallback channel versions if wiki fetch fails
 DEFAULT_CHANNEL_VERSIONS = {
@@ -78,13 +119,13 @@ DEFAULT_CHANNEL_VERSIONS = {
 
 WIKI_URL = "https://raw.githubusercontent.com/wiki/brave/brave-browser/Brave-Release-Schedule.md"
 
-# Patterns to strip from stack frames for PII safety
-PII_PATH_PATTERNS = [
-    re.compile(r"/Users/[^\s/]+"),
-    re.compile(r"/home/[^\s/]+"),
-    re.compile(r"C:\\Users\\[^\s\\]+"),
-    re.compile(r"/var/[^\s/]*/[^\s/]+"),
-]
+# Paths to strip from stack frames for PII safety
+_PII_RE = re.compile(
+    r"/Users/[^\s/]+"
+    r"|/home/[^\s/]+"
+    r"|C:\\Users\\[^\s\\]+"
+    r"|/var/[^\s/]*/[^\s/]+"
+)
 
 
 # ---------------------------------------------------------------------------
@@ -119,30 +160,33 @@ def find_brave_src(explicit_path=None):
     return None
 
 
+# Top-level namespaces whose symbols are never grepped for in brave source
+_NO_GREP_NAMESPACES = frozenset([
+    "std", "absl", "__cxxabiv1", "__gnu_cxx",  # C++ standard/support libs
+    "core", "alloc",  # Rust standard library
+])
+
 _symbol_grep_cache = {}
+# Names whose search failed or timed out; their False is not persisted.
+_symbol_grep_errors = set()
 
 
-def symbol_in_brave_src(symbol, brave_src_path):
-    """Check if a crashing symbol is defined/implemented in brave source.
-
-    Extracts the short function name from a qualified C++ symbol and greps
-    for it in the brave source tree. Uses ripgrep if available, falls back
-    to grep.
+def _grep_name(symbol):
+    """Extract the short function name to grep for from a crashing symbol.
 
     Args:
         symbol: Qualified C++ symbol (e.g. "BrowserView::NonClientHitTest").
-        brave_src_path: Path to the src/brave directory.
 
     Returns:
-        True if the symbol is found in brave source.
+        The name to search for, or None if the symbol should not be grepped.
     """
-    if not brave_src_path or not symbol or symbol == "unknown":
-        return False
+    if not symbol or symbol == "unknown":
+        return None
 
     # Skip unqualified C/system function names (no :: means it's likely a
     # system function like g_log, clone, start_thread, main, etc.)
     if "::" not in symbol:
-        return False
+        return None
 
     # Strip template params and function args before extracting name
     clean = re.sub(r'<[^>]*>', '', symbol)
@@ -160,10 +204,157 @@ def symbol_in_brave_src(symbol, brave_src_path):
 
     # Skip very short or generic names that would match too broadly
     if not search_name or len(search_name) < 6:
-        return False
+        return None
+
+    # Skip standard library namespaces: brave never defines these, so any
+    # hit would just be a call site (std::vector::push_back -> "push_back")
+    if parts[0] in _NO_GREP_NAMESPACES:
+        return None
 
     # Skip known system/library symbols
     if search_name.startswith("lib") or search_name.startswith("__"):
+        return None
+
+    return search_name
+
+
+def _cache_file(brave_src_path, suffix):
+    """Return an on-disk cache path for a brave checkout."""
+    key = os.path.abspath(brave_src_path).encode("utf-8")
+    return os.path.join(CACHE_DIR,
+                        hashlib.sha256(key).hexdigest()[:16] + suffix)
+
+
+@functools.lru_cache(maxsize=None)
+def _src_head(brave_src_path):
+    """Return the git HEAD commit of a brave checkout, or None."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", brave_src_path, "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    head = result.stdout.strip()
+    return head if result.returncode == 0 and head else None
+
+
+@functools.lru_cache(maxsize=1)
+def _brave_identifiers(brave_src_path):
+    """Return every identifier in brave C++ source, newline separated.
+
+    Built with one ripgrep (or grep) pass over the tree and stored on disk
+    next to the symbol cache, keyed by the checkout's HEAD commit, so later
+    runs at the same commit don't walk the tree at all.
+
+    Args:
+        brave_src_path: Path to the src/brave directory.
+
+    Returns:
+        "\n"-joined unique identifiers of 6+ characters, or None if the
+        search failed.
+    """
+    head = _src_head(brave_src_path)
+    index_file = _cache_file(brave_src_path, ".idents")
+    if head:
+        try:
+            with open(index_file) as f:
+                if f.readline().rstrip("\n") == head:
+                    return f.read()
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    # Names shorter than 6 characters are never looked up
+    pattern = r"[A-Za-z0-9_]{6,}"
+    rg_path = shutil.which("rg")
+    try:
+        if rg_path:
+            result = subprocess.run(
+                [rg_path, "-o", "-N", "-I", "--type", "cpp",
+                 "--type-add", "cpp:*.mm", "-e", pattern, brave_src_path],
+                capture_output=True, text=True, errors="replace", timeout=60,
+            )
+        else:
+            result = subprocess.run(
+                ["grep", "-rhoE",
+                 "--include=*.cc", "--include=*.h", "--include=*.mm",
+                 "-e", pattern, brave_src_path],
+                capture_output=True, text=True, errors="replace", timeout=60,
+            )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    if result.returncode not in (0, 1):
+        return None
+
+    identifiers = "\n".join(sorted(set(result.stdout.split())))
+    if head:
+        tmp_path = f"{index_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                f.write(head + "\n" + identifiers)
+            # Atomic rename so concurrent runs never read a partial index
+            os.replace(tmp_path, index_file)
+        except OSError:
+            pass
+    return identifiers
+
+
+def prewarm_symbol_cache(symbols, brave_src_path):
+    """Resolve many crashing symbols against brave source at once.
+
+    Looks every not-yet-cached name up in the identifier index from
+    _brave_identifiers() and records the result in _symbol_grep_cache, so
+    symbol_in_brave_src() doesn't have to spawn a process per crasher.
+    Names that aren't plain identifiers, and all names if the index can't
+    be built, are left to the per-symbol grep.
+
+    Args:
+        symbols: Iterable of qualified C++ symbols (typically top frames).
+        brave_src_path: Path to the src/brave directory.
+    """
+    if not brave_src_path:
+        return
+
+    names = set()
+    for symbol in symbols:
+        name = _grep_name(symbol)
+        if (name and name not in _symbol_grep_cache
+                and re.fullmatch(r'[A-Za-z0-9_]+', name)):
+            names.add(name)
+    if not names:
+        return
+
+    identifiers = _brave_identifiers(brave_src_path)
+    if identifiers is None:
+        return
+
+    # The per-symbol grep is a substring match. A name is a substring of
+    # the source iff it is one of some identifier, and no identifier spans
+    # the newline separators, so one substring test covers them all.
+    for name in names:
+        _symbol_grep_cache[name] = name in identifiers
+
+
+def symbol_in_brave_src(symbol, brave_src_path):
+    """Check if a crashing symbol is defined/implemented in brave source.
+
+    Extracts the short function name from a qualified C++ symbol and greps
+    for it in the brave source tree. Uses ripgrep if available, falls back
+    to grep. Results seeded by prewarm_symbol_cache() are reused.
+
+    Args:
+        symbol: Qualified C++ symbol (e.g. "BrowserView::NonClientHitTest").
+        brave_src_path: Path to the src/brave directory.
+
+    Returns:
+        True if the symbol is found in brave source.
+    """
+    if not brave_src_path:
+        return False
+
+    search_name = _grep_name(symbol)
+    if not search_name:
         return False
 
     if search_name in _symbol_grep_cache:
@@ -187,17 +378,63 @@ def symbol_in_brave_src(symbol, brave_src_path):
         found = result.returncode == 0 and bool(result.stdout.strip())
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         found = False
+        _symbol_grep_errors.add(search_name)
 
     _symbol_grep_cache[search_name] = found
     return found
 
 
+def load_symbol_cache(brave_src_path):
+    """Seed _symbol_grep_cache from disk if it was built at the same commit.
+
+    The cache is keyed by the checkout's HEAD commit, so uncommitted edits
+    to brave source are not picked up until HEAD moves.
+
+    Args:
+        brave_src_path: Path to the src/brave directory.
+
+    Returns:
+        The HEAD commit to pass to save_symbol_cache(), or None if
+        brave_src_path is not a git checkout.
+    """
+    head = _src_head(brave_src_path)
+    if not head:
+        return None
+    try:
+        with open(_cache_file(brave_src_path, ".json")) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return head
+    if isinstance(cached, dict) and cached.get("head") == head:
+        symbols = cached.get("symbols")
+        if isinstance(symbols, dict):
+            _symbol_grep_cache.update(symbols)
+    return head
+
+
+def save_symbol_cache(brave_src_path, head):
+    """Store _symbol_grep_cache on disk for head. Write failures are not fatal."""
+    symbols = {name: found for name, found in _symbol_grep_cache.items()
+               if name not in _symbol_grep_errors}
+    cache_file = _cache_file(brave_src_path, ".json")
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"head": head, "symbols": symbols}, f)
+        # Atomic rename so concurrent runs never read a partial cache
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        pass
+
+
 def is_brave_frame(frame):
     """Check if a stack frame belongs to Brave-specific code (by namespace)."""
-    for pattern in BRAVE_CODE_PATTERNS:
-        if pattern.search(frame):
-            return True
-    return False
+    return _BRAVE_CODE_RE.search(frame) is not None
+
+
+# Crash groups often share their top frames, so cache verdicts by them.
+_origin_cache = {}
 
 
 def classify_code_origin(frames, brave_src_path=None):
@@ -219,24 +456,34 @@ def classify_code_origin(frames, brave_src_path=None):
     if not frames:
         return "chromium"
 
-    top_frames = frames[:3]
-
-    # Strategy 1: namespace heuristics (fast, checks for brave_ prefixes)
-    brave_count = sum(1 for f in top_frames if is_brave_frame(f))
+    top_frames = tuple(frames[:3])
+    key = (top_frames, brave_src_path)
+    if key in _origin_cache:
+        return _origin_cache[key]
+
+    # Strategy 1: namespace heuristics (fast, checks for brave_ prefixes).
+    # Stop once both kinds of frame are seen: the result is "mixed".
+    saw_brave = saw_other = False
+    for f in top_frames:
+        if is_brave_frame(f):
+            saw_brave = True
+        else:
+            saw_other = True
+        if saw_brave and saw_other:
+            break
 
+    if saw_brave:
+        origin = "mixed" if saw_other else "brave"
     # Strategy 2: grep the crashing function (frame[0]) in brave source.
     # Only checks the top frame to avoid false positives from generic method
-    # names deeper in the stack.
-    if brave_count == 0 and brave_src_path:
-        if symbol_in_brave_src(frames[0], brave_src_path):
-            brave_count = 1
-
-    if brave_count == 0:
-        return "chromium"
-    elif brave_count == len(top_frames):
-        return "brave"
+    # names deeper in the stack. A hit counts as one brave frame.
+    elif brave_src_path and symbol_in_brave_src(frames[0], brave_src_path):
+        origin = "brave" if len(top_frames) == 1 else "mixed"
     else:
-        return "mixed"
+        origin = "chromium"
+
+    _origin_cache[key] = origin
+    return origin
 
 
 # ---------------------------------------------------------------------------
@@ -325,6 +572,8 @@ def parse_brave_version(version_str):
     return None
 
 
+# The same few dozen versions recur across every crasher's histogram
+@functools.lru_cache(maxsize=2048)
 def format_brave_version(version_str):
     """Format version string for human display.
 
@@ -344,22 +593,18 @@ def format_brave_version(version_str):
     return str(version_str)
 
 
-def build_channel_breakdown(version_hist, channel_versions):
+def build_channel_breakdown(version_hist, ver_to_channel):
     """Map a version histogram to channel counts.
 
     Args:
         version_hist: Dict of {version_string: count}.
-        channel_versions: Dict of {channel: "MAJOR.MINOR"} from wiki.
+        ver_to_channel: Dict of {"MAJOR.MINOR": channel}, the inverse of
+            the wiki's channel versions (see parse_response).
 
     Returns:
         Tuple of (channel_breakdown_dict, affects_nightly_bool).
         channel_breakdown has keys: "nightly", "beta", "release", "older".
     """
-    # Invert channel_versions: "1.87" -> "release"
-    ver_to_channel = {}
-    for channel, ver in channel_versions.items():
-        ver_to_channel[ver] = channel
-
     breakdown = {"nightly": 0, "beta": 0, "release": 0, "older": 0}
 
     for version_str, count in version_hist.items():
@@ -396,6 +641,70 @@ def classify_crash_type(classifier):
 # Backtrace API client
 # ---------------------------------------------------------------------------
 
+# Serializes stderr lines from backtrace_query(), which --compare runs on
+# two threads at once.
+_stderr_lock = threading.Lock()
+
+
+def _log(message):
+    """Print a line to stderr without interleaving with other threads."""
+    with _stderr_lock:
+        print(message, file=sys.stderr)
+
+
+# Keep-alive connection to the Backtrace API, so retries and later queries
+# skip the TCP and TLS handshake. http.client connections are not
+# thread-safe, so each thread keeps its own.
+_backtrace_local = threading.local()
+
+
+def _backtrace_post(path, data):
+    """POST to the Backtrace API over this thread's keep-alive connection.
+
+    Args:
+        path: Request path including the query string.
+        data: Encoded JSON request body.
+
+    Returns:
+        Raw response body bytes.
+
+    Raises:
+        urllib.error.HTTPError on non-2xx responses, urllib.error.URLError
+        if Backtrace could not be reached, TimeoutError on a timeout.
+    """
+    host = urllib.parse.urlsplit(BACKTRACE_ENDPOINT).netloc
+    headers = {"Content-Type": "application/json"}
+
+    # A keep-alive connection may have been closed by the server since the
+    # last call; reconnect once before treating it as a network error.
+    for attempt in range(2):
+        conn = getattr(_backtrace_local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(host, timeout=REQUEST_TIMEOUT)
+            _backtrace_local.conn = conn
+        try:
+            conn.request("POST", path, body=data, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+            break
+        except TimeoutError:
+            conn.close()
+            _backtrace_local.conn = None
+            raise
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            _backtrace_local.conn = None
+            if attempt:
+                raise urllib.error.URLError(e)
+
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            f"{BACKTRACE_ENDPOINT}{path.split('?')[0]}", resp.status,
+            resp.reason, resp.headers, io.BytesIO(raw),
+        )
+    return raw
+
+
 def backtrace_query(project, query_body, api_key, verbose=False):
     """POST a query to the Backtrace coronerd API.
 
@@ -416,94 +725,69 @@ def backtrace_query(project, query_body, api_key, verbose=False):
         "project": project,
         "token": api_key,
     })
-    url = f"{BACKTRACE_ENDPOINT}/api/query?{params}"
+    path = f"/api/query?{params}"
     data = json.dumps(query_body).encode("utf-8")
 
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-
-    last_err = None
+    # Each attempt either breaks out with a response or exits; the final
+    # attempt never falls through to the next iteration.
     for attempt in range(1 + MAX_RETRIES):
         if attempt > 0:
-            wait = RETRY_BACKOFF[min(attempt - 1, len(RETRY_BACKOFF) - 1)]
-            print(f"  Retrying in {wait}s (attempt {attempt + 1})...",
-                  file=sys.stderr)
+            wait = RETRY_BACKOFF[min(attempt - 1, _RETRY_BACKOFF_MAX_IDX)]
+            _log(f"  Retrying in {wait}s (attempt {attempt + 1})...")
             time.sleep(wait)
 
         t0 = time.monotonic()
         try:
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-                raw = resp.read()
+            raw = _backtrace_post(path, data)
             elapsed = time.monotonic() - t0
             if verbose:
-                print(f"  API response: {len(raw)} bytes in {elapsed:.1f}s",
-                      file=sys.stderr)
+                _log(f"  API response: {len(raw)} bytes in {elapsed:.1f}s")
             break
         except urllib.error.HTTPError as e:
             elapsed = time.monotonic() - t0
             body_preview = ""
             try:
-                body_preview = e.read().decode("utf-8", errors="replace")[:500]
+                # Only the preview is shown, so don't read/decode the rest
+                body_preview = e.read(500).decode("utf-8", errors="replace")
             except Exception:
                 pass
 
             if e.code == 401 or e.code == 403:
-                print(
-                    f"Error: HTTP {e.code} from Backtrace API. "
-                    "Check that BACKTRACE_API_KEY has query:post capability.",
-                    file=sys.stderr,
-                )
+                _log(f"Error: HTTP {e.code} from Backtrace API. "
+                     "Check that BACKTRACE_API_KEY has query:post capability.")
                 if body_preview:
-                    print(f"Response: {body_preview}", file=sys.stderr)
+                    _log(f"Response: {body_preview}")
                 sys.exit(1)
 
             if e.code == 429 or e.code >= 500:
-                last_err = e
-                print(f"  HTTP {e.code} after {elapsed:.1f}s",
-                      file=sys.stderr)
+                _log(f"  HTTP {e.code} after {elapsed:.1f}s")
                 if attempt < MAX_RETRIES:
                     continue
 
-            print(
-                f"Error: HTTP {e.code} from Backtrace API: {e.reason}",
-                file=sys.stderr,
-            )
+            _log(f"Error: HTTP {e.code} from Backtrace API: {e.reason}")
             if body_preview:
-                print(f"Response: {body_preview}", file=sys.stderr)
+                _log(f"Response: {body_preview}")
             sys.exit(2)
         except urllib.error.URLError as e:
-            last_err = e
             elapsed = time.monotonic() - t0
-            print(f"  Network error after {elapsed:.1f}s: {e.reason}",
-                  file=sys.stderr)
+            _log(f"  Network error after {elapsed:.1f}s: {e.reason}")
             if attempt < MAX_RETRIES:
                 continue
-            print(f"Error: Could not connect to Backtrace API: {e.reason}",
-                  file=sys.stderr)
+            _log(f"Error: Could not connect to Backtrace API: {e.reason}")
             sys.exit(2)
         except TimeoutError:
-            last_err = TimeoutError("Request timed out")
-            print(f"  Request timed out after {REQUEST_TIMEOUT}s",
-                  file=sys.stderr)
+            _log(f"  Request timed out after {REQUEST_TIMEOUT}s")
             if attempt < MAX_RETRIES:
                 continue
-            print(f"Error: Backtrace API request timed out after "
-                  f"{MAX_RETRIES + 1} attempts.", file=sys.stderr)
+            _log(f"Error: Backtrace API request timed out after "
+                 f"{MAX_RETRIES + 1} attempts.")
             sys.exit(2)
-    else:
-        print(f"Error: All {MAX_RETRIES + 1} attempts failed: {last_err}",
-              file=sys.stderr)
-        sys.exit(2)
 
     try:
-        return json.loads(raw)
+        return _json_loads(raw)
     except json.JSONDecodeError:
-        print("Error: Could not parse API response as JSON.", file=sys.stderr)
-        print(f"Raw (first 500 bytes): {raw[:500]}", file=sys.stderr)
+        _log("Error: Could not parse API response as JSON.")
+        _log(f"Raw (first 500 bytes): {raw[:500]}")
         sys.exit(2)
 
 
@@ -530,6 +814,8 @@ def build_query(days_start, days_end_ts, limit, platform=None, version=None,
     if platform:
         filters["uname.sysname"] = [["equal", platform]]
     if version:
+        # coronerd has no documented prefix operator for string attributes;
+        # an anchored, escaped regex is the cheapest exact prefix match.
         filters["version"] = [["regular-expression", f"^{re.escape(version)}"]]
     if channel:
         filters["channel"] = [["equal", channel]]
@@ -556,13 +842,17 @@ def build_query(days_start, days_end_ts, limit, platform=None, version=None,
 # Response parsing (allowlist-only)
 # ---------------------------------------------------------------------------
 
+def _as_str(value):
+    """Return value as a string, skipping the str() call if it already is one."""
+    return value if type(value) is str else str(value)
+
+
 def sanitize_frame(frame):
     """Sanitize a single stack frame string for PII safety."""
     if not isinstance(frame, str):
         return str(frame)[:MAX_FRAME_LENGTH]
 
-    for pattern in PII_PATH_PATTERNS:
-        frame = pattern.sub("<path>", frame)
+    frame = _PII_RE.sub("<path>", frame)
 
     if len(frame) > MAX_FRAME_LENGTH:
         frame = frame[:MAX_FRAME_LENGTH] + "..."
@@ -579,21 +869,34 @@ def extract_top_bucket(histogram):
     if not histogram or not isinstance(histogram, dict):
         return None, 0.0
 
-    total = sum(histogram.values())
+    # Single pass; on ties the first bucket wins, as with max().
+    total = 0
+    top_val = None
+    top_count = None
+    for val, n in histogram.items():
+        total += n
+        if top_count is None or n > top_count:
+            top_val = val
+            top_count = n
     if total == 0:
         return None, 0.0
 
-    top_val = max(histogram, key=lambda k: histogram[k])
-    pct = histogram[top_val] / total
-    return str(top_val), pct
+    return str(top_val), top_count / total
+
 
+def format_recency(last_seen_ts, now=None):
+    """Format a unix timestamp as a human-readable recency string.
 
-def format_recency(last_seen_ts):
-    """Format a unix timestamp as a human-readable recency string."""
+    Args:
+        last_seen_ts: Unix timestamp to describe.
+        now: Current unix time; defaults to time.time(). Callers formatting
+            many timestamps pass one value in.
+    """
     if not last_seen_ts:
         return "unknown"
 
-    now = time.time()
+    if now is None:
+        now = time.time()
     delta = now - last_seen_ts
 
     if delta < 60:
@@ -613,7 +916,10 @@ def format_timestamp(ts):
     """Format a unix timestamp as ISO date string."""
     if not ts:
         return "unknown"
-    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    # Plain %-formatting of gmtime() fields is cheaper than datetime+strftime
+    tm = time.gmtime(ts)
+    return "%04d-%02d-%02d %02d:%02d UTC" % (
+        tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min)
 
 
 def parse_callstack_json(raw_str):
@@ -632,11 +938,11 @@ def parse_callstack_json(raw_str):
         return [str(raw_str)] if raw_str else []
 
     try:
-        parsed = json.loads(raw_str)
+        parsed = _json_loads(raw_str)
         if isinstance(parsed, dict) and "frame" in parsed:
-            return [str(f) for f in parsed["frame"]]
+            return [_as_str(f) for f in parsed["frame"]]
         if isinstance(parsed, list):
-            return [str(f) for f in parsed]
+            return [_as_str(f) for f in parsed]
     except (json.JSONDecodeError, TypeError):
         pass
 
@@ -660,11 +966,8 @@ def histogram_from_pairs(pairs):
         return pairs
     if not isinstance(pairs, list):
         return {}
-    result = {}
-    for item in pairs:
-        if isinstance(item, list) and len(item) >= 2:
-            result[str(item[0])] = item[1]
-    return result
+    return {_as_str(item[0]): item[1] for item in pairs
+            if isinstance(item, list) and len(item) >= 2}
 
 
 def parse_response(response, days, max_frames, min_count, lookback_start_ts,
@@ -722,11 +1025,23 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
     if not values:
         return []
 
+    # Invert channel_versions once for all crashers: "1.87" -> "release"
+    ver_to_channel = None
+    if channel_versions:
+        ver_to_channel = {ver: channel
+                          for channel, ver in channel_versions.items()}
+
+    # Per-response constants, hoisted out of the per-crasher loop
+    now = time.time()
+    rate_days = max(days, 1)
+    triage_base = (f"{BACKTRACE_ENDPOINT}/p/{urllib.parse.quote(project)}"
+                   f"/triage?fingerprints=")
+
     for entry in values:
         if not isinstance(entry, list) or len(entry) < 2:
             continue
 
-        fingerprint = str(entry[0])
+        fingerprint = _as_str(entry[0])
         folds = entry[1]
 
         if not isinstance(folds, list) or len(folds) < 6:
@@ -749,14 +1064,16 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
         else:
             cs = callstack_raw
 
-        frames = parse_callstack_json(cs)
-        frames = [sanitize_frame(f) for f in frames if f and str(f).strip()]
-        frames = frames[:max_frames]
+        # Only sanitize the frames that will be kept. parse_callstack_json()
+        # always returns strings.
+        frames = list(itertools.islice(
+            (sanitize_frame(f) for f in parse_callstack_json(cs) if f.strip()),
+            max_frames))
 
         # Extract classifiers
         classifiers_raw = folds[FOLD_CLASSIFIERS]
         if isinstance(classifiers_raw, list) and classifiers_raw:
-            classifier = str(classifiers_raw[0])
+            classifier = _as_str(classifiers_raw[0])
         elif isinstance(classifiers_raw, str):
             classifier = classifiers_raw
         else:
@@ -779,7 +1096,7 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
         platform_hist = histogram_from_pairs(folds[FOLD_PLATFORM])
 
         # Computed fields
-        crashes_per_day = round(count / max(days, 1), 1)
+        crashes_per_day = round(count / rate_days, 1)
         top_frame = frames[0] if frames else "unknown"
         top_platform, platform_pct = extract_top_bucket(platform_hist)
         top_version, version_pct = extract_top_bucket(version_hist)
@@ -792,15 +1109,12 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
         # Crash type: "dump" (DumpWithoutCrashing) vs "crash" (real)
         crash_type = classify_crash_type(classifier)
 
-        # Code origin: "brave", "chromium", or "mixed"
-        code_origin = classify_code_origin(frames, brave_src_path=brave_src_path)
-
         # Channel breakdown
         channel_breakdown = {"nightly": 0, "beta": 0, "release": 0, "older": 0}
         affects_nightly = False
-        if channel_versions:
+        if ver_to_channel:
             channel_breakdown, affects_nightly = build_channel_breakdown(
-                version_hist, channel_versions)
+                version_hist, ver_to_channel)
 
         # Top channel
         top_channel = max(channel_breakdown, key=channel_breakdown.get) if any(
@@ -822,14 +1136,9 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
             labels.append(top_platform.lower().replace(" ", "-"))
         if is_new:
             labels.append("regression")
-        if code_origin == "brave":
-            labels.append("brave-code")
 
         # Triage URL
-        triage_url = (
-            f"{BACKTRACE_ENDPOINT}/p/{urllib.parse.quote(project)}"
-            f"/triage?fingerprints={urllib.parse.quote(fingerprint)}"
-        )
+        triage_url = triage_base + urllib.parse.quote(fingerprint)
 
         crashers.append({
             "fingerprint": fingerprint,
@@ -837,7 +1146,7 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
             "crashes_per_day": crashes_per_day,
             "classifier": classifier,
             "crash_type": crash_type,
-            "code_origin": code_origin,
+            "code_origin": None,  # filled in below
             "top_frame": top_frame,
             "signature": sig,
             "callstack": frames,
@@ -848,19 +1157,33 @@ def parse_response(response, days, max_frames, min_count, lookback_start_ts,
             "top_version": top_version,
             "version_pct": round(version_pct * 100, 1),
             "channel_breakdown": channel_breakdown,
+            "_nonzero_channels": frozenset(
+                ch for ch, n in channel_breakdown.items() if n),
             "top_channel": top_channel,
             "affects_nightly": affects_nightly,
             "first_seen": format_timestamp(first_seen_ts),
             "first_seen_ts": first_seen_ts,
             "last_seen": format_timestamp(last_seen_ts),
             "last_seen_ts": last_seen_ts,
-            "recency": format_recency(last_seen_ts),
+            "recency": format_recency(last_seen_ts, now),
             "is_new": is_new,
             "triage_url": triage_url,
             "suggested_title": suggested_title,
             "labels": labels,
         })
 
+    # Code origin: "brave", "chromium", or "mixed". Classified after the
+    # loop so all top frames can be grepped for in a single search.
+    if brave_src_path:
+        prewarm_symbol_cache(
+            (c["callstack"][0] for c in crashers if c["callstack"]),
+            brave_src_path)
+    for c in crashers:
+        c["code_origin"] = classify_code_origin(
+            c["callstack"], brave_src_path=brave_src_path)
+        if c["code_origin"] == "brave":
+            c["labels"].append("brave-code")
+
     return crashers
 
 
@@ -884,6 +1207,10 @@ def sort_crashers(crashers, order):
 # Regression detection
 # ---------------------------------------------------------------------------
 
+# Sort order of regression badges in compare mode
+_BADGE_ORDER = {"NEW": 0, "RISING": 1, "STABLE": 2, "FALLING": 3}
+
+
 def compare_windows(recent, baseline):
     """Compare two lists of crash groups to detect regressions.
 
@@ -892,73 +1219,114 @@ def compare_windows(recent, baseline):
         baseline: List of crash group dicts from the baseline window.
 
     Returns:
-        List of crash group dicts annotated with regression info, sorted
-        by severity of change.
+        The recent list, annotated with regression info and sorted in
+        place by severity of change.
     """
+    # Keyed by the fingerprint string itself: str caches its hash, while
+    # converting the 64-digit SHA256 hex to int costs a parse per crasher
+    # and a full 256-bit hash on every lookup.
     baseline_by_fp = {c["fingerprint"]: c for c in baseline}
 
-    annotated = []
     for c in recent:
-        fp = c["fingerprint"]
-        if fp in baseline_by_fp:
-            base_count = baseline_by_fp[fp]["count"]
-            if base_count > 0:
-                change_factor = c["count"] / base_count
-            else:
-                change_factor = float("inf")
-
-            if change_factor > 2.0:
-                c["regression_badge"] = "RISING"
-                c["change_factor"] = round(change_factor, 1)
-                c["baseline_count"] = base_count
-            elif change_factor < 0.5:
-                c["regression_badge"] = "FALLING"
-                c["change_factor"] = round(change_factor, 1)
-                c["baseline_count"] = base_count
-            else:
-                c["regression_badge"] = "STABLE"
-                c["change_factor"] = round(change_factor, 1)
-                c["baseline_count"] = base_count
-        else:
+        base = baseline_by_fp.get(c["fingerprint"])
+        if base is None:
             c["regression_badge"] = "NEW"
-            c["change_factor"] = float("inf")
+            c["change_factor"] = None
             c["baseline_count"] = 0
+            continue
 
-        annotated.append(c)
+        # change_factor is None when there is no finite ratio to report
+        base_count = base["count"]
+        if base_count > 0:
+            change_factor = c["count"] / base_count
+            badge = ("RISING" if change_factor > 2.0
+                     else "FALLING" if change_factor < 0.5
+                     else "STABLE")
+            change_factor = round(change_factor, 1)
+        else:
+            badge, change_factor = "RISING", None
+        c["regression_badge"], c["change_factor"], c["baseline_count"] = (
+            badge, change_factor, base_count)
 
-    # Sort: NEW first, then RISING by factor, then rest
-    badge_priority = {"NEW": 0, "RISING": 1, "STABLE": 2, "FALLING": 3}
-    annotated.sort(key=lambda c: (
-        badge_priority.get(c.get("regression_badge", "STABLE"), 99),
-        -c["count"],
-    ))
+    # Sort: NEW, RISING, STABLE, FALLING; by count within each badge
+    recent.sort(key=lambda c: (_BADGE_ORDER[c["regression_badge"]],
+                               -c["count"]))
 
-    for i, c in enumerate(annotated, 1):
+    for i, c in enumerate(recent, 1):
         c["rank"] = i
 
-    return annotated
+    return recent
 
 
 # ---------------------------------------------------------------------------
 # Output formatters
 # ---------------------------------------------------------------------------
 
-def format_markdown(crashers, days, compare_mode=False):
-    """Format crash groups as copy/paste-ready markdown."""
-    lines = []
-    lines.append("# Top Crashers Report")
-    lines.append("")
-    lines.append(f"> PII-safe aggregate summary. For full crash details, "
-                 f"use the triage URLs below.")
-    lines.append("")
-    lines.append(f"**Lookback:** {days} days | "
-                 f"**Generated:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')} | "
-                 f"**Crashers:** {len(crashers)}")
-    lines.append("")
+# Header of each crasher's field table in the markdown report
+_MD_TABLE_HEADER = "| Field | Value |\n|-------|-------|\n"
+
+
+def _top_buckets(histogram, n=5, _sum=sum, _sorted=sorted, _round=round):
+    """Return the n largest (value, rounded pct) buckets of a histogram.
+
+    Called twice per crasher in the markdown report; the builtins are bound
+    as defaults so the lookups are local rather than global.
+    """
+    total = _sum(histogram.values())
+    ranked = _sorted(histogram.items(), key=lambda x: x[1], reverse=True)
+    return [(v, _round(count / total * 100)) for v, count in ranked[:n]]
+
+
+def annotate_breakdowns(c):
+    """Store a crasher's channel/platform/version breakdowns for display.
+
+    Sets "_channel_pcts" to [(channel, pct), ...] for the non-zero channels,
+    and "_top_platforms" / "_top_versions" to the top five buckets when
+    there is more than one. Each is empty when its section isn't shown.
+    Computed once per crasher; only the markdown report displays these.
+    """
+    if "_channel_pcts" in c:
+        return
+
+    ch = c.get("channel_breakdown", {})
+    ch_total = sum(ch.values())
+    c["_channel_pcts"] = [
+        (chan, round(ch[chan] / ch_total * 100))
+        for chan in ("nightly", "beta", "release", "older")
+        if ch.get(chan, 0) > 0
+    ]
+
+    platforms = c.get("platforms")
+    c["_top_platforms"] = (_top_buckets(platforms)
+                           if platforms and len(platforms) > 1 else [])
+    versions = c.get("versions")
+    c["_top_versions"] = (_top_buckets(versions)
+                          if versions and len(versions) > 1 else [])
+
+
+def iter_markdown(crashers, days, compare_mode=False, generated_at=None):
+    """Yield crash groups as copy/paste-ready markdown, line by line.
+
+    Each yielded string ends with a newline, so the output can be streamed
+    to write_stdout() without building the whole report. generated_at is
+    the UTC datetime shown in the header (default: now).
+    """
+    if generated_at is None:
+        generated_at = datetime.now(timezone.utc)
+    generated = generated_at.strftime('%Y-%m-%d %H:%M UTC')
+    yield "# Top Crashers Report\n"
+    yield "\n"
+    yield ("> PII-safe aggregate summary. For full crash details, "
+           "use the triage URLs below.\n")
+    yield "\n"
+    yield (f"**Lookback:** {days} days | "
+           f"**Generated:** {generated} | "
+           f"**Crashers:** {len(crashers)}\n")
+    yield "\n"
 
     if not crashers:
-        lines.append("No crashes found matching the criteria.")
-        return "\n".join(lines)
+        yield "No crashes found matching the criteria.\n"
+        return
 
     for c in crashers:
         # Build badges
@@ -977,122 +1345,131 @@ def format_markdown(crashers, days, compare_mode=False):
         elif c.get("is_new"):
             badges.append("NEW")
 
-        badge_str = " ".join(f"[{b}]" for b in badges)
+        badge_str = "[" + "] [".join(badges) + "]"
 
-        lines.append(
-            f"### #{c['rank']} — {c['suggested_title']} {badge_str}"
-        )
-        lines.append("")
+        yield f"### #{c['rank']} — {c['suggested_title']} {badge_str}\n"
+        yield "\n"
 
-        lines.append("| Field | Value |")
-        lines.append("|-------|-------|")
-        lines.append(f"| Fingerprint | `{c['fingerprint']}` |")
-        lines.append(
-            f"| Count | {c['count']:,} ({c['crashes_per_day']}/day) |"
-        )
-        lines.append(
+        yield _MD_TABLE_HEADER
+        yield f"| Fingerprint | `{c['fingerprint']}` |\n"
+        yield f"| Count | {c['count']:,} ({c['crashes_per_day']}/day) |\n"
+        yield (
             f"| Type | {crash_type.upper()} "
-            f"({'DumpWithoutCrashing' if crash_type == 'dump' else 'Actual crash'}) |"
+            f"({'DumpWithoutCrashing' if crash_type == 'dump' else 'Actual crash'}) |\n"
         )
-        lines.append(f"| Code origin | {code_origin} |")
-        lines.append(f"| Classifier | {c['classifier']} |")
+        yield f"| Code origin | {code_origin} |\n"
+        yield f"| Classifier | {c['classifier']} |\n"
 
         if c.get("top_platform"):
-            lines.append(
+            yield (
                 f"| Top platform | {c['top_platform']} "
-                f"({c['platform_pct']}%) |"
+                f"({c['platform_pct']}%) |\n"
             )
         if c.get("top_version"):
-            lines.append(
+            yield (
                 f"| Top version | {format_brave_version(c['top_version'])} "
-                f"({c['version_pct']}%) |"
+                f"({c['version_pct']}%) |\n"
             )
 
+        annotate_breakdowns(c)
+
         # Channel breakdown
-        ch = c.get("channel_breakdown", {})
-        ch_total = sum(ch.values())
-        if ch_total > 0:
-            ch_parts = []
-            for chan in ["nightly", "beta", "release", "older"]:
-                n = ch.get(chan, 0)
-                if n > 0:
-                    pct = round(n / ch_total * 100)
-                    ch_parts.append(f"{chan.capitalize()} {pct}%")
-            lines.append(f"| Channels | {', '.join(ch_parts)} |")
-            lines.append(
+        if c["_channel_pcts"]:
+            channels = ", ".join(f"{chan.capitalize()} {pct}%"
+                                 for chan, pct in c["_channel_pcts"])
+            yield f"| Channels | {channels} |\n"
+            yield (
                 f"| Affects Nightly | "
-                f"{'Yes' if c.get('affects_nightly') else 'No'} |"
+                f"{'Yes' if c.get('affects_nightly') else 'No'} |\n"
             )
 
-        lines.append(f"| First seen | {c['first_seen']} |")
-        lines.append(
-            f"| Last seen | {c['last_seen']} ({c['recency']}) |"
-        )
+        yield f"| First seen | {c['first_seen']} |\n"
+        yield f"| Last seen | {c['last_seen']} ({c['recency']}) |\n"
         if compare_mode and "baseline_count" in c:
-            lines.append(
-                f"| Baseline count | {c['baseline_count']:,} |"
-            )
-            if c.get("change_factor") != float("inf"):
-                lines.append(
-                    f"| Change factor | {c['change_factor']}x |"
-                )
-        lines.append(f"| Triage | {c['triage_url']} |")
-        lines.append("")
+            yield f"| Baseline count | {c['baseline_count']:,} |\n"
+            if c.get("change_factor") is not None:
+                yield f"| Change factor | {c['change_factor']}x |\n"
+        yield f"| Triage | {c['triage_url']} |\n"
+        yield "\n"
 
         if c.get("callstack"):
-            lines.append(
-                f"**Callstack (top {len(c['callstack'])} frames):**"
-            )
-            lines.append("```")
+            yield f"**Callstack (top {len(c['callstack'])} frames):**\n"
+            yield "```\n"
             for frame in c["callstack"]:
-                lines.append(frame)
-            lines.append("```")
-            lines.append("")
+                yield frame + "\n"
+            yield "```\n"
+            yield "\n"
 
         # Platform breakdown if multiple
-        if c.get("platforms") and len(c["platforms"]) > 1:
-            total = sum(c["platforms"].values())
-            sorted_plats = sorted(c["platforms"].items(),
-                                  key=lambda x: x[1], reverse=True)
-            plat_parts = [
-                f"{p} ({round(n / total * 100)}%)"
-                for p, n in sorted_plats[:5]
-            ]
-            lines.append(f"**Platforms:** {', '.join(plat_parts)}")
-            lines.append("")
+        if c["_top_platforms"]:
+            platforms = ", ".join(f"{p} ({pct}%)"
+                                  for p, pct in c["_top_platforms"])
+            yield f"**Platforms:** {platforms}\n"
+            yield "\n"
 
         # Version breakdown if multiple
-        if c.get("versions") and len(c["versions"]) > 1:
-            total = sum(c["versions"].values())
-            sorted_vers = sorted(c["versions"].items(),
-                                 key=lambda x: x[1], reverse=True)
-            ver_parts = [
-                f"{format_brave_version(v)} ({round(n / total * 100)}%)"
-                for v, n in sorted_vers[:5]
-            ]
-            lines.append(f"**Versions:** {', '.join(ver_parts)}")
-            lines.append("")
-
-        lines.append(
-            f"**Suggested issue title:** {c['suggested_title']}"
-        )
-        lines.append(f"**Labels:** {', '.join(c['labels'])}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        if c["_top_versions"]:
+            versions = ", ".join(f"{format_brave_version(v)} ({pct}%)"
+                                 for v, pct in c["_top_versions"])
+            yield f"**Versions:** {versions}\n"
+            yield "\n"
+
+        yield f"**Suggested issue title:** {c['suggested_title']}\n"
+        yield f"**Labels:** {', '.join(c['labels'])}\n"
+        yield "\n"
+        yield "---\n"
+        yield "\n"
+
+
+# Field set for --compact JSON/NDJSON output; COMPARE_FIELDS are appended
+# in compare mode.
+COMPACT_FIELDS = (
+    "rank", "fingerprint", "count", "crashes_per_day", "top_frame",
+    "top_platform", "top_version", "suggested_title",
+)
+COMPARE_FIELDS = ("regression_badge", "change_factor", "baseline_count")
+
+# Every field --fields may select, with the value used when a crasher
+# lacks it (matching the full JSON output)
+OUTPUT_FIELD_DEFAULTS = {
+    "rank": None, "fingerprint": None, "count": None,
+    "crashes_per_day": None, "classifier": None, "crash_type": "crash",
+    "code_origin": "chromium", "top_frame": None, "signature": None,
+    "callstack": None, "top_platform": None, "platform_pct": None,
+    "platforms": {}, "top_version": None, "version_pct": None,
+    "versions": {}, "channel_breakdown": {}, "top_channel": "unknown",
+    "affects_nightly": False, "first_seen": None, "last_seen": None,
+    "recency": None, "is_new": None, "triage_url": None,
+    "suggested_title": None, "labels": None, "regression_badge": "STABLE",
+    "change_factor": None, "baseline_count": None,
+}
+
 
-    return "\n".join(lines)
+def _select_fields(c, fields):
+    """Build an output entry holding only the given fields of a crasher."""
+    return {k: c.get(k, OUTPUT_FIELD_DEFAULTS[k]) for k in fields}
 
 
-def format_json_output(crashers, days, compare_mode=False):
-    """Format crash groups as a single JSON object."""
+def format_json_output(crashers, days, compare_mode=False, fields=None,
+                       generated_at=None):
+    """Format crash groups as a single JSON object.
+
+    If fields is given, each crasher entry holds only those keys, in order.
+    generated_at is the UTC datetime reported as "generated_utc" (default:
+    now).
+    """
+    if generated_at is None:
+        generated_at = datetime.now(timezone.utc)
     output = {
-        "generated_utc": datetime.now(timezone.utc).isoformat(),
+        "generated_utc": generated_at.isoformat(),
         "lookback_days": days,
         "total_crashers": len(crashers),
         "compare_mode": compare_mode,
         "crashers": [],
     }
+    if fields:
+        output["crashers"] = [_select_fields(c, fields) for c in crashers]
+        return _json_dumps_indented(output)
 
     for c in crashers:
         entry = {
@@ -1130,12 +1507,19 @@ def format_json_output(crashers, days, compare_mode=False):
 
         output["crashers"].append(entry)
 
-    return json.dumps(output, indent=2)
+    return _json_dumps_indented(output)
 
 
-def format_ndjson(crashers, compare_mode=False):
-    """Format crash groups as newline-delimited JSON (one object per line)."""
-    lines = []
+def iter_ndjson(crashers, compare_mode=False, fields=None):
+    """Yield crash groups as newline-delimited JSON (one object per line).
+
+    If fields is given, each line holds only those keys, in order.
+    """
+    if fields:
+        for c in crashers:
+            yield _json_dumps_compact(_select_fields(c, fields)) + "\n"
+        return
+
     for c in crashers:
         entry = {
             "rank": c["rank"],
@@ -1168,9 +1552,7 @@ def format_ndjson(crashers, compare_mode=False):
             entry["change_factor"] = c.get("change_factor")
             entry["baseline_count"] = c.get("baseline_count")
 
-        lines.append(json.dumps(entry))
-
-    return "\n".join(lines)
+        yield _json_dumps_compact(entry) + "\n"
 
 
 def format_csv_output(crashers, compare_mode=False):
@@ -1187,16 +1569,30 @@ def format_csv_output(crashers, compare_mode=False):
     if compare_mode:
         fields.extend(["regression_badge", "change_factor", "baseline_count"])
 
-    writer = csv.DictWriter(buf, fieldnames=fields, extrasaction="ignore")
-    writer.writeheader()
-
-    for c in crashers:
-        row = {k: c.get(k, "") for k in fields}
-        writer.writerow(row)
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    writer.writerows([c.get(k, "") for k in fields] for c in crashers)
 
     return buf.getvalue()
 
 
+def write_stdout(chunks):
+    """Write text chunks to stdout as UTF-8 bytes.
+
+    Goes straight to the binary buffer, skipping the per-call encoding and
+    flush checks of the text layer; falls back to it when stdout has no
+    buffer (e.g. when replaced by a StringIO).
+    """
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.writelines(chunks)
+        return
+    sys.stdout.flush()
+    for chunk in chunks:
+        out.write(chunk.encode("utf-8"))
+    out.flush()
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -1286,6 +1682,15 @@ def main():
         help="Path to src/brave directory for code origin detection "
              "(auto-discovered if not set)",
     )
+    parser.add_argument(
+        "--fields",
+        help="Comma-separated crasher fields to emit in json/ndjson output "
+             "(e.g. rank,fingerprint,count)",
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="Emit only the compact field set in json/ndjson output",
+    )
     parser.add_argument(
         "--compare", type=int, metavar="DAYS",
         help="Regression detection: compare last N days vs prior N days",
@@ -1327,6 +1732,31 @@ def main():
         print("Error: --frames must be at least 1.", file=sys.stderr)
         sys.exit(1)
 
+    output_fields = None
+    if args.fields or args.compact:
+        if args.format not in ("json", "ndjson"):
+            print("Error: --fields and --compact only apply to json and "
+                  "ndjson output.", file=sys.stderr)
+            sys.exit(1)
+        if args.fields:
+            output_fields = tuple(
+                f.strip() for f in args.fields.split(",") if f.strip())
+            unknown = [f for f in output_fields
+                       if f not in OUTPUT_FIELD_DEFAULTS]
+            if not output_fields:
+                print("Error: --fields needs at least one field name.",
+                      file=sys.stderr)
+                sys.exit(1)
+            if unknown:
+                print(f"Error: unknown --fields: {', '.join(unknown)}. "
+                      f"Valid fields: {', '.join(OUTPUT_FIELD_DEFAULTS)}",
+                      file=sys.stderr)
+                sys.exit(1)
+        else:
+            output_fields = COMPACT_FIELDS
+            if args.compare:
+                output_fields += COMPARE_FIELDS
+
     # Calculate time window
     now = datetime.now(timezone.utc)
     now_ts = now.timestamp()
@@ -1360,6 +1790,18 @@ def main():
         channel=args.channel,
     )
 
+    # --compare also queries the N days before the recent window
+    baseline_query = None
+    if args.compare:
+        baseline_start = (now - timedelta(days=days * 2)).timestamp()
+        baseline_end = start_ts
+        baseline_query = build_query(
+            baseline_start, baseline_end, query_limit,
+            platform=args.platform,
+            version=args.version,
+            channel=args.channel,
+        )
+
     if args.dry_run:
         params_display = urllib.parse.urlencode({
             "universe": BACKTRACE_UNIVERSE,
@@ -1371,17 +1813,7 @@ def main():
         print(f"\nQuery body:")
         print(json.dumps(query, indent=2))
 
-        if args.compare:
-            baseline_start = (
-                now - timedelta(days=days * 2)
-            ).timestamp()
-            baseline_end = start_ts
-            baseline_query = build_query(
-                baseline_start, baseline_end, query_limit,
-                platform=args.platform,
-                version=args.version,
-                channel=args.channel,
-            )
+        if baseline_query:
             print(f"\nBaseline query body:")
             print(json.dumps(baseline_query, indent=2))
 
@@ -1400,6 +1832,10 @@ def main():
               "Code origin detection will use namespace heuristics only. "
               "Use --brave-src to specify the path.", file=sys.stderr)
 
+    # Reuse symbol grep results from earlier runs at the same brave commit
+    src_head = load_symbol_cache(brave_src_path) if brave_src_path else None
+    cached_symbols = len(_symbol_grep_cache)
+
     # Fetch channel versions for version-to-channel mapping
     channel_versions = fetch_channel_versions(verbose=args.verbose)
 
@@ -1408,8 +1844,21 @@ def main():
 
     print(f"Querying Backtrace for top crashers in '{args.project}' "
           f"(last {days} days)...", file=sys.stderr)
-    response = backtrace_query(args.project, query, api_key,
-                               verbose=args.verbose)
+    if baseline_query:
+        # The two windows are independent; fetch them concurrently
+        print(f"Querying baseline window ({days}-{days * 2} days ago)...",
+              file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            baseline_future = executor.submit(
+                backtrace_query, args.project, baseline_query, api_key,
+                verbose=args.verbose,
+            )
+            response = backtrace_query(args.project, query, api_key,
+                                       verbose=args.verbose)
+            baseline_response = baseline_future.result()
+    else:
+        response = backtrace_query(args.project, query, api_key,
+                                   verbose=args.verbose)
     crashers = parse_response(
         response, days, args.frames, args.min_count, start_ts, args.project,
         channel_versions=channel_versions, brave_src_path=brave_src_path,
@@ -1420,24 +1869,8 @@ def main():
               file=sys.stderr)
 
     if args.compare:
-        # Query baseline window
-        baseline_start = (now - timedelta(days=days * 2)).timestamp()
-        baseline_end = start_ts
-        baseline_days = days
-
-        print(f"Querying baseline window ({days}-{days * 2} days ago)...",
-              file=sys.stderr)
-        baseline_query = build_query(
-            baseline_start, baseline_end, query_limit,
-            platform=args.platform,
-            version=args.version,
-            channel=args.channel,
-        )
-        baseline_response = backtrace_query(
-            args.project, baseline_query, api_key, verbose=args.verbose,
-        )
         baseline_crashers = parse_response(
-            baseline_response, baseline_days, args.frames, 0,
+            baseline_response, days, args.frames, 0,
             baseline_start, args.project,
             channel_versions=channel_versions, brave_src_path=brave_src_path,
         )
@@ -1457,17 +1890,23 @@ def main():
         # Sort and rank
         crashers = sort_crashers(crashers, args.order)
 
-    # Apply post-query filters
-    if args.crashes_only:
-        crashers = [c for c in crashers if c.get("crash_type") != "dump"]
+    if src_head and len(_symbol_grep_cache) != cached_symbols:
+        save_symbol_cache(brave_src_path, src_head)
+
+    # Apply post-query filters in a single pass
+    selected_channels = None
     if args.channels and args.channels.lower() != "all":
-        selected_channels = [ch.strip().lower() for ch in args.channels.split(",")]
-        crashers = [c for c in crashers
-                    if any(c.get("channel_breakdown", {}).get(ch, 0) > 0
-                           for ch in selected_channels)]
-    if args.brave_only:
-        crashers = [c for c in crashers
-                    if c.get("code_origin") in ("brave", "mixed")]
+        selected_channels = frozenset(
+            ch.strip().lower() for ch in args.channels.split(","))
+    if args.crashes_only or selected_channels or args.brave_only:
+        crashers = [
+            c for c in crashers
+            if (not args.crashes_only or c.get("crash_type") != "dump")
+            and (not selected_channels
+                 or selected_channels & c["_nonzero_channels"])
+            and (not args.brave_only
+                 or c.get("code_origin") in ("brave", "mixed"))
+        ]
 
     # Re-rank after filtering
     for i, c in enumerate(crashers, 1):
@@ -1481,13 +1920,16 @@ def main():
 
     # Output
     if args.format == "markdown":
-        print(format_markdown(crashers, days, compare_mode))
+        write_stdout(iter_markdown(crashers, days, compare_mode,
+                                   generated_at=now))
     elif args.format == "json":
-        print(format_json_output(crashers, days, compare_mode))
+        write_stdout((format_json_output(crashers, days, compare_mode,
+                                         output_fields, generated_at=now),
+                      "\n"))
     elif args.format == "ndjson":
-        print(format_ndjson(crashers, compare_mode))
+        write_stdout(iter_ndjson(crashers, compare_mode, output_fields))
     elif args.format == "csv":
-        print(format_csv_output(crashers, compare_mode))
+        write_stdout((format_csv_output(crashers, compare_mode), "\n"))
 
     sys.exit(0)
 